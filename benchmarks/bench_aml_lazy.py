@@ -0,0 +1,36 @@
+"""
+Compares full AML search response decoding against lazy views reading a few fields of every entity.
+
+    python benchmarks/bench_aml_lazy.py
+"""
+
+import timeit
+
+import orjson
+from payloads import aml_response
+from pydantic import TypeAdapter
+
+from dataspike import AMLResponse, LazyAMLResponse
+
+
+def main() -> None:
+    raw = orjson.dumps(aml_response(200))
+    adapter = TypeAdapter(AMLResponse)
+
+    def full() -> None:
+        for entity in adapter.validate_python(orjson.loads(raw)).data:
+            entity.risk_score, entity.fields.names  # noqa: B018
+
+    def lazy() -> None:
+        for entity in LazyAMLResponse(orjson.loads(raw)):
+            entity.risk_score, entity.fields.names  # noqa: B018
+
+    print("aml response, 200 entities, risk_score and names of each")
+    for variant, fn in {"full validation": full, "lazy views": lazy}.items():
+        n = 20
+        t = min(timeit.repeat(fn, number=n, repeat=5))
+        print(f"    {variant:20} {t / n * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
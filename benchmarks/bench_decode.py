@@ -0,0 +1,41 @@
+"""
+Compares response decoding: json parsing followed by model construction
+against precompiled TypeAdapters, validating straight from bytes or from json.loads or orjson output.
+
+    python benchmarks/bench_decode.py
+"""
+
+import json
+import timeit
+
+import orjson
+from payloads import aml_response, verifications_page
+from pydantic import TypeAdapter
+
+from dataspike import AMLResponse, PagedResponse, Verification
+
+
+def main() -> None:
+    cases = [
+        ("aml response, 200 entities", AMLResponse, orjson.dumps(aml_response(200))),
+        ("verifications page, 100 items", PagedResponse[Verification], orjson.dumps(verifications_page(100))),
+    ]
+    for name, model, raw in cases:
+        adapter = TypeAdapter(model)
+        validate = adapter.validate_python
+        variants = {
+            "json.loads + Model(**data)": lambda: model(**json.loads(raw)),  # noqa: B023
+            "orjson.loads + Model(**data)": lambda: model(**orjson.loads(raw)),  # noqa: B023
+            "TypeAdapter.validate_json": lambda: adapter.validate_json(raw),  # noqa: B023
+            "json.loads + TypeAdapter.validate_python": lambda: validate(json.loads(raw)),  # noqa: B023
+            "orjson.loads + TypeAdapter.validate_python": lambda: validate(orjson.loads(raw)),  # noqa: B023
+        }
+        print(name)
+        for variant, fn in variants.items():
+            n = 20
+            t = min(timeit.repeat(fn, number=n, repeat=5))
+            print(f"    {variant:45} {t / n * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
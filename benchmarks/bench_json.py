@@ -0,0 +1,41 @@
+"""
+Compares json backends on request encoding and response decoding.
+
+    python benchmarks/bench_json.py
+"""
+
+import timeit
+from uuid import UUID
+
+from payloads import aml_response, verifications_page
+
+from dataspike import AMLSearchRequest, DateRange, EntityType, RiskScore
+from dataspike.json_backend import OrjsonBackend, StdlibJsonBackend
+
+
+def main() -> None:
+    request = AMLSearchRequest(
+        full_name="John Doe",
+        risk_scores=[RiskScore.High, RiskScore.Medium],
+        countries=["GB", "US"],
+        entity_types=[EntityType.Person],
+        date_of_birth=DateRange(gte="1990-01-01", lte="1990-12-31"),
+    )
+    body = {"ids": [UUID(int=i) for i in range(100)], "request": request}
+    stdlib = StdlibJsonBackend()
+    responses = {
+        "aml response, 200 entities": stdlib.dumps(aml_response(200)).encode(),
+        "verifications page, 100 items": stdlib.dumps(verifications_page(100)).encode(),
+    }
+    for backend in (StdlibJsonBackend(), OrjsonBackend()):
+        n = 2000
+        t = timeit.timeit(lambda: backend.dumps(body), number=n)  # noqa: B023
+        print(f"{backend.name:8} {'encode request':40} {t / n * 1e3:8.3f} ms")
+        for name, raw in responses.items():
+            n = 50
+            t = timeit.timeit(lambda: backend.loads(raw), number=n)  # noqa: B023
+            print(f"{backend.name:8} {'decode ' + name:40} {t / n * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+SyncApi construction time with wrappers bound eagerly, as SyncApi did before, and lazily
+on first attribute access. Measured on a shared event loop, Api construction is included.
+
+    python benchmarks/bench_sync_startup.py
+"""
+
+import asyncio
+import time
+from copy import deepcopy
+from functools import wraps
+from typing import Any, Callable
+
+import payloads  # noqa: F401  # makes dataspike importable from a checkout
+from dataspike import SyncApi
+from dataspike.resource import Resource
+
+
+def eager_bind(api: Any, run: Callable[[Any], Any]) -> None:
+    """
+    Former SyncApi.__init__ binding: every public coroutine of every resource is wrapped up front.
+    """
+
+    def call(fn: Any) -> Any:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return run(fn(*args, **kwargs))
+
+        return wrapper
+
+    for attr in dir(api):
+        r = getattr(api, attr)
+        if not isinstance(r, Resource):
+            continue
+        holder = type(attr, (object,), {})()
+        for n in dir(r):
+            if n.startswith("_"):
+                continue
+            m = getattr(r, n)
+            c = getattr(m, "raw_function", m)
+            if not asyncio.iscoroutinefunction(c):
+                continue
+            setattr(holder, n, deepcopy(call(m)))
+
+
+def best(fn: Callable[[], None], n: int = 200, repeat: int = 5) -> float:
+    result = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(n):
+            fn()
+        result = min(result, time.perf_counter() - started)
+    return result / n
+
+
+def main() -> None:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    apis = []
+
+    def lazy() -> None:
+        apis.append(SyncApi("token"))
+
+    def eager() -> None:
+        sync = SyncApi("token")
+        eager_bind(sync._SyncApi__api, loop.run_until_complete)  # type: ignore[attr-defined]
+        apis.append(sync)
+
+    def lazy_first_call() -> None:
+        sync = SyncApi("token")
+        sync.verification.get  # noqa: B018
+        apis.append(sync)
+
+    for name, fn in (("eager binding", eager), ("lazy binding", lazy), ("lazy + one method", lazy_first_call)):
+        t = best(fn)
+        print(f"{name:20} {t * 1e6:8.1f} us")
+        for sync in apis:
+            sync.close()
+        apis.clear()
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Per-call client overhead of strict and trusted validation modes: argument validation,
+response decoding and model construction. Network is replaced with canned responses.
+
+    python benchmarks/bench_validation.py
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, ClassVar
+from uuid import UUID
+
+import orjson
+from payloads import applicants_page, verification
+
+from dataspike import Api
+
+
+class CannedResponse:
+    status = 200
+    headers: ClassVar[dict] = {}
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def read(self) -> bytes:
+        return self.body
+
+
+def serve(resource: Any, body: bytes) -> None:
+    @asynccontextmanager
+    async def request(*args: Any, **kwargs: Any) -> AsyncIterator[CannedResponse]:
+        yield CannedResponse(body)
+
+    resource._request = request
+
+
+async def per_call(fn: Callable[[], Awaitable[Any]], n: int = 1000, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(n):
+            await fn()
+        best = min(best, time.perf_counter() - started)
+    return best / n
+
+
+async def main() -> None:
+    verification_id = UUID(int=10)
+    cases = {
+        "verification.get": (
+            lambda api: api.verification,
+            orjson.dumps(verification(10)),
+            lambda api: api.verification.get(verification_id),
+        ),
+        "applicant.list, 10 items": (
+            lambda api: api.applicant,
+            orjson.dumps(applicants_page(10)),
+            lambda api: api.applicant.list(page=0, limit=10),
+        ),
+    }
+    for name, (resource, body, call) in cases.items():
+        print(name)
+        for mode in ("strict", "trusted"):
+            async with Api("token", validation=mode, single_flight=False) as api:
+                serve(resource(api), body)
+                t = await per_call(lambda: call(api))  # noqa: B023
+            print(f"    {mode:10} {t * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
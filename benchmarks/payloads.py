@@ -0,0 +1,90 @@
+"""
+Synthetic API payloads shared by benchmarks.
+"""
+
+import pathlib
+import sys
+import uuid
+from datetime import datetime, timezone
+
+try:
+    import dataspike  # noqa: F401
+except ImportError:
+    sys.path.insert(0, pathlib.Path(__file__).parent.parent.resolve().as_posix())
+
+
+def verification(i: int) -> dict:
+    check = {"status": "verified", "errors": [], "pending_documents": [], "data": {"name": "JOHN", "n": i}}
+    return {
+        "id": str(uuid.UUID(int=i)),
+        "applicant_id": str(uuid.UUID(int=i + 1)),
+        "status": "verified",
+        "organization_id": "org_123",
+        "account_id": "api",
+        "account_email": "api@api.api",
+        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat(),
+        "completed_at": datetime(2024, 1, 2, tzinfo=timezone.utc).isoformat(),
+        "is_sandbox": False,
+        "document_type": "passport",
+        "checks": {"document_mrz": check, "document_ocr": check, "face_comparison": check, "liveness": check},
+        "document_ids": [str(uuid.UUID(int=i + 2)), str(uuid.UUID(int=i + 3))],
+        "documents": [
+            {"document_id": str(uuid.UUID(int=i + 2)), "document_type": "passport"},
+            {"document_id": str(uuid.UUID(int=i + 3)), "document_type": "selfie"},
+        ],
+        "poi_data": {"full_name": "JOHN DOE", "country": "GB", "birth_date": "1990-01-01", "sex": "M"},
+    }
+
+
+def verifications_page(size: int) -> dict:
+    return {"data": [verification(i * 10) for i in range(size)], "has_next": True}
+
+
+def applicant(i: int) -> dict:
+    info = {"full_name": f"John Doe {i}", "first_name": "John", "last_name": "Doe", "dob": "1990-01-01"}
+    return {
+        "applicant_id": str(uuid.UUID(int=i)),
+        "external_id": f"ext-{i}",
+        "verification_status": "passed",
+        "system_info": info,
+        "provided_info": info,
+    }
+
+
+def applicants_page(size: int) -> dict:
+    return {"data": [applicant(i) for i in range(size)], "has_next": True}
+
+
+def aml_entity(i: int) -> dict:
+    location = {"country": "GB", "city": "London", "address": f"{i} Baker Street"}
+    return {
+        "uuid": str(uuid.UUID(int=i)),
+        "type": "Person",
+        "risk_score": "High",
+        "tags": ["PEP", "Sanctions"],
+        "annotation": "annotation",
+        "fields": {
+            "names": [{"full_name": f"John Doe {i}", "first_name": "John", "last_name": "Doe", "lang": "en"}],
+            "sources": [
+                {"name": "OFAC", "source_id": "US_OFAC_SDN", "risk_score": "High", "tags": ["Sanctions"]},
+                {"name": "New source", "source_id": "NEW_SOURCE", "summary": "summary " * 20},
+            ],
+            "media": [{"source_name": "news", "headline": "headline", "summary": "summary " * 50}],
+            "addresses": [location, location],
+            "places_of_birth": [location],
+            "dates_of_birth": [{"gte": "1970-01-01", "lte": "1970-12-31"}],
+            "citizenships": ["GB", "US"],
+            "political_roles": [{"role": "Minister", "country": "GB"}],
+            "occupations": [{"occupation": "Politician", "country": "GB"}],
+            "companies_and_enterprises": [{"name": "ACME", "role": "Owner", "country": "GB"}],
+            "updated_at": 1700000000,
+        },
+    }
+
+
+def aml_response(size: int) -> dict:
+    return {
+        "requested_name": "John Doe",
+        "search_uuid": str(uuid.UUID(int=42)),
+        "data": [aml_entity(i) for i in range(size)],
+    }
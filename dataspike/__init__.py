@@ -1,9 +1,23 @@
 from .dataspike import Api
 from .syncapi import SyncApi
+from .pool import PoolConfig
+from .retry import RetryPolicy, RetryEvent
+from .ratelimit import RateLimit, RateLimiter
+from .breaker import CircuitBreaker, CircuitBreakerConfig, CircuitState
+from .hedging import HedgingPolicy
+from .cache import CacheConfig
+from .cache_backend import CacheBackend, SQLiteCacheBackend
+from .pagination import AdaptiveLimit
+from .export import ExportStats
+from .bulk import BulkResult
 from .applicants.model import *
 from .verifications.model import *
+from .verifications.watch import WatchPolicy, VerificationChange
 from .documents.model import *
 from .aml.model import *
+from .documents.documents import DocumentStream
+from .aml.lazy import LazyAMLResponse, LazyAMLEntity, LazyEntityFields
+from .webhooks import *
 from .common import *
 
 from .__version__ import __version__
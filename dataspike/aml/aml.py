@@ -1,31 +1,162 @@
+import asyncio
+import dataclasses
+import json
+import unicodedata
+from typing import Any, AsyncContextManager, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
 from uuid import UUID
 
-from aiohttp.client import _RequestContextManager
+from aiohttp import ClientResponse, ClientSession
 from pydantic import validate_call
 
+from .lazy import LazyAMLResponse
 from .model import AMLSearchRequest, AMLResponse, AMLEntity
+from ..bulk import BulkResult, _aiter, run_bulk
+from ..cache_backend import CacheBackend
+from ..json_backend import validate_parsed
 from ..resource import Resource
+from ..trusted import adapter_for
 
-__all__ = ["AML"]
+__all__ = ["AML", "canonical_request"]
+
+_entity_adapter = adapter_for(AMLEntity)
+# pydantic's json parser is slower than validation of parsed json on search responses with many entities
+_response_adapter = validate_parsed(adapter_for(AMLResponse))
+
+
+def _normalize(value: Any, upper: bool = False) -> Any:
+    if isinstance(value, str):
+        value = " ".join(unicodedata.normalize("NFKC", value).split())
+        return value.upper() if upper else value
+    return value
+
+
+def _normalize_list(values: Optional[List[Any]], upper: bool = False) -> Optional[List[Any]]:
+    if values is None:
+        return None
+    return sorted({_normalize(v, upper) for v in values}, key=str)
+
+
+def canonical_request(request: AMLSearchRequest) -> AMLSearchRequest:
+    """
+    Equivalent request with normalized whitespace and sorted, deduplicated filters.
+    """
+    return AMLSearchRequest(
+        full_name=_normalize(request.full_name),
+        risk_scores=_normalize_list(request.risk_scores),  # type: ignore[arg-type]
+        countries=_normalize_list(request.countries, upper=True),
+        cities=_normalize_list(request.cities),
+        entity_types=_normalize_list(request.entity_types),
+        postal_codes=_normalize_list(request.postal_codes, upper=True),
+        date_of_birth=request.date_of_birth,
+        tags=_normalize_list(request.tags),
+        sources=_normalize_list(request.sources),
+        registration_ids=_normalize_list(request.registration_ids),
+    )
+
+
+def _request_key(request: AMLSearchRequest) -> str:
+    # names are matched case insensitively
+    data = dataclasses.asdict(request)
+    data["full_name"] = request.full_name.casefold()
+    return json.dumps(data, sort_keys=True)
 
 
 class AML(Resource):
-    def _search(self, request: AMLSearchRequest) -> _RequestContextManager:
-        return self._session.post(url=f"{self._api_endpoint}/api/v3/aml/search", json=request)
+    _family = "aml"
 
-    def _get(self, id: UUID) -> _RequestContextManager:
-        return self._session.get(url=f"{self._api_endpoint}/api/v3/aml/search/{id}")
+    def __init__(
+        self, session: ClientSession, api_endpoint: str, entity_cache: Optional[CacheBackend] = None, **kwargs: Any
+    ):
+        """
+        :param entity_cache: persistent storage of entities returned by get and search
+        """
+        super().__init__(session, api_endpoint, **kwargs)
+        self._entity_cache = entity_cache
+
+    def _search(self, request: AMLSearchRequest) -> AsyncContextManager[ClientResponse]:
+        return self._request("POST", "/api/v3/aml/search", json=request)
 
     @validate_call
     async def search(self, request: AMLSearchRequest) -> AMLResponse:
         async with self._search(request) as response:
             await self._validate_resp(response, [200], "aml search")
-            data = await response.json()
-            return AMLResponse(**data)
+            raw = await response.read()
+        result = self._decode(_response_adapter, raw)
+        await self._store_entities(result.data)
+        return result
+
+    @validate_call
+    async def search_lazy(self, request: AMLSearchRequest) -> LazyAMLResponse:
+        """
+        Same as search, but entities and their field groups are validated only when accessed.
+        Entities aren't stored in entity cache.
+        """
+        async with self._search(request) as response:
+            await self._validate_resp(response, [200], "aml search")
+            data = await self._read_json(response)
+        return LazyAMLResponse(data)
+
+    def search_many(
+        self,
+        requests: Union[Iterable[AMLSearchRequest], AsyncIterable[AMLSearchRequest]],
+        concurrency: int = 10,
+        ordered: bool = True,
+    ) -> AsyncIterator[BulkResult[AMLSearchRequest, AMLResponse]]:
+        """
+        Screens requests from a sync or async iterable with at most concurrency searches in flight.
+        Yields a result with response or error per request, in input order or in completion order if not ordered.
+        Equivalent requests, see canonical_request, share one search and one response object while any of them
+        is waiting to be yielded, so memory use doesn't depend on the number of requests.
+        """
+        searches: Dict[str, "asyncio.Future[AMLResponse]"] = {}
+        # pulled requests per search key which are not yielded yet
+        pending: Dict[str, int] = {}
+
+        async def keyed() -> AsyncIterator[Tuple[AMLSearchRequest, AMLSearchRequest, str]]:
+            async for request in _aiter(requests):
+                canonical = canonical_request(request)
+                key = _request_key(canonical)
+                pending[key] = pending.get(key, 0) + 1
+                yield request, canonical, key
+
+        async def search(item: Tuple[AMLSearchRequest, AMLSearchRequest, str]) -> AMLResponse:
+            _, canonical, key = item
+            if key in searches:
+                # don't cancel search owned by another request
+                return await asyncio.shield(searches[key])
+            task = searches[key] = asyncio.ensure_future(self.search(canonical))
+            return await task
+
+        async def results() -> AsyncIterator[BulkResult[AMLSearchRequest, AMLResponse]]:
+            bulk = run_bulk(search, keyed(), concurrency, ordered)
+            try:
+                async for result in bulk:
+                    request, _, key = result.item
+                    pending[key] -= 1
+                    if not pending[key]:
+                        del pending[key]
+                        searches.pop(key, None)
+                    yield BulkResult(result.index, request, result.value, result.error)
+            finally:
+                await bulk.aclose()
+
+        return results()
+
+    def _cache_tags(self, value: AMLEntity) -> Iterable[str]:
+        return (str(value.uuid),)
+
+    async def _store_entities(self, entities: Iterable[AMLEntity]) -> None:
+        if self._entity_cache is not None:
+            await self._entity_cache.set_many(
+                {str(e.uuid): _entity_adapter.dump_json(e, exclude_none=True) for e in entities}
+            )
 
     @validate_call
     async def get(self, id: UUID) -> AMLEntity:
-        async with self._get(id) as response:
-            await self._validate_resp(response, [200], "aml get")
-            data = await response.json()
-            return AMLEntity(**data)
+        if self._entity_cache is not None:
+            stored = await self._entity_cache.get(str(id))
+            if stored is not None:
+                return self._decode(_entity_adapter, stored)
+        entity = await self._fetch("aml get", _entity_adapter, "/api/v3/aml/search/{}", id, cached=True)
+        await self._store_entities([entity])
+        return entity
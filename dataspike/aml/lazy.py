@@ -0,0 +1,155 @@
+import dataclasses
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+    get_type_hints,
+    overload,
+)
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from pydantic_core import SchemaValidator
+
+from .model import AMLEntity, AMLResponse, EntityFields
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pydantic.plugin._schema_validator import PluggableSchemaValidator
+
+__all__ = ["LazyAMLResponse", "LazyAMLEntity", "LazyEntityFields"]
+
+
+@lru_cache(maxsize=None)
+def _field_validators(model: type) -> Dict[str, Union[SchemaValidator, "PluggableSchemaValidator"]]:
+    # core validators skip per call bookkeeping of TypeAdapter, it matters for many small fields
+    hints = get_type_hints(model)
+    return {f.name: TypeAdapter(hints[f.name]).validator for f in dataclasses.fields(model)}
+
+
+@lru_cache(maxsize=None)
+def _model_adapter(model: type) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+class _LazyView:
+    """
+    Read-only view of a pydantic dataclass over parsed json, every field is validated on first access.
+    """
+
+    __model__: ClassVar[Type[Any]]
+    # fields exposed as lazy views instead of validated models
+    __nested__: ClassVar[Dict[str, Type["_LazyView"]]] = {}
+
+    def __init__(self, raw: Dict[str, Any]):
+        self._raw = raw
+        self._values: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        values = self.__dict__["_values"]
+        if name in values:
+            return values[name]
+        validators = _field_validators(self.__model__)
+        if name not in validators:
+            raise AttributeError(f"{self.__model__.__name__} has no field {name}")
+        if name not in self._raw:
+            field = next(f for f in dataclasses.fields(self.__model__) if f.name == name)
+            value = validators[name].validate_python(_default(field))
+        elif name in self.__nested__ and self._raw[name] is not None:
+            value = self.__nested__[name](self._raw[name])
+        else:
+            value = validators[name].validate_python(self._raw[name])
+        values[name] = value
+        return value
+
+    def materialize(self) -> Any:
+        """
+        Validates the whole object, same as non-lazy decoding.
+        """
+        return _model_adapter(self.__model__).validate_python(self._raw)
+
+    def __repr__(self) -> str:
+        validated = ", ".join(self._values)
+        return f"Lazy{self.__model__.__name__}<validated: {validated or 'nothing'}>"
+
+
+def _default(field: "dataclasses.Field[Any]") -> Any:
+    # pydantic Field(...) is stored as dataclass default
+    default = getattr(field.default, "default", field.default)
+    if default is dataclasses.MISSING:
+        factory = getattr(field.default, "default_factory", None)
+        if factory is not None:
+            return factory()
+        raise AttributeError(f"required field {field.name} is missing")
+    return default
+
+
+class LazyEntityFields(_LazyView):
+    __model__ = EntityFields
+
+
+class LazyAMLEntity(_LazyView):
+    """
+    AMLEntity view, e.g. entity.risk_score or entity.fields.names validate only what is accessed.
+    """
+
+    __model__ = AMLEntity
+    __nested__: ClassVar[Dict[str, Type[_LazyView]]] = {"fields": LazyEntityFields}
+
+    uuid: UUID
+    fields: LazyEntityFields
+
+    def materialize(self) -> AMLEntity:
+        return super().materialize()
+
+
+class LazyAMLResponse(Sequence[LazyAMLEntity]):
+    """
+    AML search response keeping parsed json, entities are wrapped into lazy views on access.
+    """
+
+    def __init__(self, raw: Dict[str, Any]):
+        self._raw = raw
+        self._entities: List[Optional[LazyAMLEntity]] = [None] * len(raw.get("data") or ())
+        self.requested_name: str = raw["requested_name"]
+        self.search_uuid = UUID(raw["search_uuid"])
+
+    @property
+    def data(self) -> "LazyAMLResponse":
+        return self
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    @overload
+    def __getitem__(self, index: int) -> LazyAMLEntity: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[LazyAMLEntity]: ...
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        entity = self._entities[index]
+        if entity is None:
+            entity = self._entities[index] = LazyAMLEntity(self._raw["data"][index])
+        return entity
+
+    def __iter__(self) -> Iterator[LazyAMLEntity]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def materialize(self) -> AMLResponse:
+        return _model_adapter(AMLResponse).validate_python(self._raw)
+
+    def __repr__(self) -> str:
+        return f"LazyAMLResponse<{self.requested_name}, {len(self)} entities>"
@@ -260,7 +260,7 @@ class Gender(StrEnum):
 class EntityFields:
     names: List[EntityName]
     sources: Optional[List[SourceData]] = Field(default=None)
-    media: Optional[AdverseMedia] = Field(default=None)  # array or not?
+    media: Optional[List[AdverseMedia]] = Field(default=None)
     images: Optional[List[GenericData]] = Field(default=None)
     contact_info: Optional[ContactInfo] = Field(default=None)
     registration_ids: Optional[List[RegistrationId]] = Field(default=None)
@@ -1,71 +1,179 @@
+import asyncio
 import dataclasses
-from typing import Optional
+import os
+from collections import OrderedDict
+from typing import (
+    AsyncContextManager,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Optional,
+    Tuple,
+    Union,
+)
 from uuid import UUID
 
-from aiohttp.client import _RequestContextManager
+from aiohttp import ClientResponse
 from pydantic import validate_call
 
 from .model import Applicant, ApplicantInfo
+from ..bulk import BulkResult, run_bulk
 from ..common import PagedResponse
+from ..export import ExportStats, open_sink, write_pages
+from ..pagination import AdaptiveLimit, iter_items, iter_pages
 from ..resource import Resource
+from ..trusted import adapter_for
+
+_applicant = adapter_for(Applicant)
+_applicant_page = adapter_for(PagedResponse[Applicant])
+
+NewApplicant = Tuple[Optional[str], Optional[ApplicantInfo]]
+
+# external ids create_many remembers, repeats further apart are found by the existing applicant lookup
+_RECENT_EXTERNAL_IDS = 1024
 
 
 class Applicants(Resource):
-    def _get(self, applicant_id: UUID) -> _RequestContextManager:
-        return self._session.get(url=f"{self._api_endpoint}/api/v3/applicants/{applicant_id}")
+    _family = "applicants"
 
-    def _get_by_external_id(self, external_id: str) -> _RequestContextManager:
-        return self._session.get(url=f"{self._api_endpoint}/api/v3/applicants/by_external_id/{external_id}")
+    def _cache_tags(self, value: Applicant) -> Iterable[str]:
+        return (str(value.applicant_id),)
 
     @validate_call
     async def get(self, applicant_id: UUID) -> Optional[Applicant]:
-        async with self._get(applicant_id) as response:
-            if response.status == 404:
-                return None
-            await self._validate_resp(response, [200], "get applicant")
-            data = await response.json()
-        return Applicant(**data)
+        return await self._find("get applicant", _applicant, "/api/v3/applicants/{}", applicant_id, cached=True)
 
     @validate_call
     async def get_by_external_id(self, external_id: str) -> Optional[Applicant]:
-        async with self._get_by_external_id(external_id) as response:
-            if response.status == 404:
-                return None
-            await self._validate_resp(response, [200], "get applicant")
-            data = await response.json()
-        return Applicant(**data)
+        return await self._find(
+            "get applicant", _applicant, "/api/v3/applicants/by_external_id/{}", external_id, cached=True
+        )
 
     def _create(
         self, external_id: Optional[str] = None, info: Optional[ApplicantInfo] = None
-    ) -> _RequestContextManager:
+    ) -> AsyncContextManager[ClientResponse]:
         body = {}
         if external_id is not None:
             body["external_id"] = external_id
         if info is not None:
             body["info"] = dataclasses.asdict(info)
-        return self._session.post(url=f"{self._api_endpoint}/api/v3/applicants", json=body)
+        return self._request("POST", "/api/v3/applicants", json=body)
 
     @validate_call
     async def create(self, external_id: Optional[str] = None, info: Optional[ApplicantInfo] = None) -> UUID:
         async with self._create(external_id, info) as response:
             await self._validate_resp(response, [201], "create applicant")
-            data = await response.json()
+            data = await self._read_json(response)
         return UUID(data["id"])
 
-    def _list(self, page: int = 0, limit: int = 10) -> _RequestContextManager:
-        return self._session.get(url=f"{self._api_endpoint}/api/v3/applicants", params={"page": page, "limit": limit})
+    async def _create_or_find(
+        self, external_id: Optional[str], info: Optional[ApplicantInfo], skip_existing: bool
+    ) -> Tuple[UUID, bool]:
+        if skip_existing and external_id is not None:
+            existing = await self.get_by_external_id(external_id)
+            if existing is not None:
+                return existing.applicant_id, True
+        return await self.create(external_id, info), False
+
+    def create_many(
+        self,
+        items: Union[Iterable[NewApplicant], AsyncIterable[NewApplicant]],
+        concurrency: int = 10,
+        ordered: bool = True,
+        skip_existing: bool = True,
+    ) -> AsyncIterator[BulkResult[NewApplicant, UUID]]:
+        """
+        Creates applicants from (external_id, info) pairs with at most concurrency requests in flight,
+        rate limits and retries of Api apply to every request.
+        Yields a result with applicant id or error per item, in input order or in completion order if not ordered.
+        Items with external_id of an existing applicant, or repeated in the input, are skipped
+        and their result holds id of that applicant. Without skip_existing only repeats among
+        at least the last 1024 external ids are skipped.
+        """
+        recent: "OrderedDict[str, asyncio.Future[Tuple[UUID, bool]]]" = OrderedDict()
+
+        async def create(item: NewApplicant) -> Tuple[UUID, bool]:
+            external_id, info = item
+            if external_id is None:
+                return await self._create_or_find(external_id, info, skip_existing)
+            if external_id in recent:
+                # don't cancel creation owned by another item
+                applicant_id, _ = await asyncio.shield(recent[external_id])
+                return applicant_id, True
+            task = recent[external_id] = asyncio.ensure_future(self._create_or_find(external_id, info, skip_existing))
+            if len(recent) > max(_RECENT_EXTERNAL_IDS, concurrency * 4):
+                oldest = next(iter(recent.values()))
+                if oldest.done():
+                    recent.popitem(last=False)
+            return await task
+
+        async def results() -> AsyncIterator[BulkResult[NewApplicant, UUID]]:
+            bulk = run_bulk(create, items, concurrency, ordered)
+            try:
+                async for result in bulk:
+                    if result.value is None:
+                        yield BulkResult(result.index, result.item, error=result.error)
+                    else:
+                        applicant_id, skipped = result.value
+                        yield BulkResult(result.index, result.item, applicant_id, skipped=skipped)
+            finally:
+                await bulk.aclose()
+
+        return results()
 
     @validate_call
     async def list(self, page: int = 0, limit: int = 10) -> PagedResponse[Applicant]:
-        async with self._list(page, limit) as response:
-            await self._validate_resp(response, [200], "list applicants")
-            data = await response.json()
-        return PagedResponse[Applicant](**data)
+        return await self._fetch(
+            "list applicants", _applicant_page, "/api/v3/applicants", params={"page": page, "limit": limit}
+        )
+
+    def iter_pages(
+        self, limit: int = 10, prefetch: int = 1, adaptive: Optional[AdaptiveLimit] = None
+    ) -> AsyncIterator[PagedResponse[Applicant]]:
+        """
+        Iterates over all applicants page by page, up to prefetch next pages are requested in background.
+        :param adaptive: adjust limit by observed page latency
+        """
+        return iter_pages(
+            lambda page, limit: self.list(page=page, limit=limit), limit=limit, prefetch=prefetch, adaptive=adaptive
+        )
+
+    def iter_all(
+        self, limit: int = 10, prefetch: int = 1, adaptive: Optional[AdaptiveLimit] = None
+    ) -> AsyncIterator[Applicant]:
+        """
+        Same as iter_pages, but yields applicants one by one.
+        """
+        return iter_items(self.iter_pages(limit=limit, prefetch=prefetch, adaptive=adaptive))
+
+    async def export(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        format: Optional[str] = None,
+        compression: Optional[str] = "auto",
+        limit: int = 100,
+        prefetch: int = 2,
+        progress: Optional[Callable[[ExportStats], None]] = None,
+    ) -> ExportStats:
+        """
+        Streams all applicants into ndjson, csv or parquet file, pages are written as they arrive
+        without building models. Format and compression are guessed from path, e.g. "applicants.csv.gz".
+        :param progress: called with export stats after every page
+        """
+        sink = open_sink(path, Applicant, format, compression, self._json.dumps)
+        pages = iter_pages(
+            lambda page, limit: self._fetch_page("list applicants", "/api/v3/applicants", page=page, limit=limit),
+            limit=limit,
+            prefetch=prefetch,
+        )
+        return await write_pages(pages, sink, progress)
 
-    def _delete(self, applicant_id: UUID) -> _RequestContextManager:
-        return self._session.delete(url=f"{self._api_endpoint}/api/v3/applicants/{applicant_id}")
+    def _delete(self, applicant_id: UUID) -> AsyncContextManager[ClientResponse]:
+        return self._request("DELETE", "/api/v3/applicants/{}", applicant_id, idempotent=True)
 
     @validate_call
     async def delete(self, applicant_id: UUID) -> None:
         async with self._delete(applicant_id) as response:
             await self._validate_resp(response, [200], "delete applicant")
+        self._invalidate(applicant_id)
@@ -0,0 +1,120 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+from .errors import CircuitOpenError
+from .utils import StrEnum
+
+__all__ = ["CircuitBreaker", "CircuitBreakerConfig", "CircuitState"]
+
+
+class CircuitState(StrEnum):
+    Closed = "closed"
+    Open = "open"
+    HalfOpen = "half_open"
+
+
+@dataclass(frozen=True)
+class CircuitBreakerConfig:
+    """
+    :param failure_rate_threshold: share of failed calls in the window which opens the circuit
+    :param window_size: number of last calls used to compute failure rate
+    :param min_calls: circuit never opens before that many calls are recorded in the window
+    :param probe_interval: seconds the circuit stays open before a probe request is let through
+    :param half_open_probes: number of probe requests allowed in half-open state
+    """
+
+    failure_rate_threshold: float = 0.5
+    window_size: int = 20
+    min_calls: int = 10
+    probe_interval: float = 30.0
+    half_open_probes: int = 1
+
+
+class _Circuit:
+    __slots__ = ["state", "window", "opened_at", "probes", "generation"]
+
+    def __init__(self, window_size: int):
+        self.state = CircuitState.Closed
+        self.window: Deque[bool] = deque(maxlen=window_size)
+        self.opened_at = 0.0
+        self.probes = 0
+        # changes with every state transition, outcomes of calls let through in other generations are ignored
+        self.generation = 0
+
+    def transition(self, state: CircuitState) -> None:
+        self.state = state
+        self.generation += 1
+
+
+class CircuitBreaker:
+    """
+    Keeps a circuit per endpoint (method and URL template).
+    Server errors, connection errors and timeouts are failures, other responses are successes.
+    """
+
+    def __init__(self, config: Optional[CircuitBreakerConfig] = None):
+        self.config = config or CircuitBreakerConfig()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = _Circuit(self.config.window_size)
+        return circuit
+
+    def state(self, endpoint: str) -> CircuitState:
+        return self._circuit(endpoint).state
+
+    def before(self, endpoint: str) -> int:
+        """
+        Raises CircuitOpenError if endpoint shouldn't be called now.
+        Returns token of the call to pass to record.
+        """
+        circuit = self._circuit(endpoint)
+        if circuit.state == CircuitState.Closed:
+            return circuit.generation
+        if circuit.state == CircuitState.Open:
+            retry_in = circuit.opened_at + self.config.probe_interval - time.monotonic()
+            if retry_in > 0:
+                raise CircuitOpenError(endpoint, retry_in)
+            circuit.transition(CircuitState.HalfOpen)
+            circuit.probes = 0
+        if circuit.probes >= self.config.half_open_probes:
+            raise CircuitOpenError(endpoint, 0.0)
+        circuit.probes += 1
+        return circuit.generation
+
+    def record(self, endpoint: str, success: Optional[bool], token: int) -> None:
+        """
+        Records outcome of a call let through by before, None means the call was abandoned.
+        Calls started before the last state transition, e.g. ones in flight when the circuit opened, are ignored,
+        so in half-open state only probes decide whether the circuit closes.
+        """
+        circuit = self._circuit(endpoint)
+        if token != circuit.generation:
+            return
+        if circuit.state == CircuitState.HalfOpen:
+            circuit.probes -= 1
+            if success is None:
+                return
+            if success:
+                circuit.transition(CircuitState.Closed)
+                circuit.window.clear()
+            else:
+                self._open(circuit)
+            return
+        if success is None:
+            return
+        circuit.window.append(success)
+        if circuit.state == CircuitState.Closed and len(circuit.window) >= self.config.min_calls:
+            failures = circuit.window.count(False)
+            if failures / len(circuit.window) >= self.config.failure_rate_threshold:
+                self._open(circuit)
+
+    @staticmethod
+    def _open(circuit: _Circuit) -> None:
+        circuit.transition(CircuitState.Open)
+        circuit.opened_at = time.monotonic()
+        circuit.window.clear()
@@ -0,0 +1,131 @@
+import asyncio
+from dataclasses import dataclass
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+__all__ = ["BulkResult", "run_bulk", "collect_bulk"]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class BulkResult(Generic[T, R]):
+    """
+    Outcome of one item of a bulk operation.
+
+    :param index: position of item in the input
+    :param item: input item
+    :param value: result of the call, None if it failed
+    :param error: exception raised by the call
+    :param skipped: item wasn't processed because its result already existed, value holds it
+    """
+
+    index: int
+    item: T
+    value: Optional[R] = None
+    error: Optional[BaseException] = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> R:
+        """
+        Returns value or raises the error.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.value  # type: ignore[return-value]
+
+
+async def _aiter(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncGenerator[T, None]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def _result(task: "asyncio.Future[R]", index: int, item: T) -> BulkResult[T, R]:
+    if task.cancelled():
+        return BulkResult(index, item, error=asyncio.CancelledError())
+    error = task.exception()
+    if error is not None:
+        return BulkResult(index, item, error=error)
+    return BulkResult(index, item, task.result())
+
+
+async def run_bulk(
+    fn: Callable[[T], Awaitable[R]],
+    items: Union[Iterable[T], AsyncIterable[T]],
+    concurrency: int = 10,
+    ordered: bool = True,
+) -> AsyncGenerator[BulkResult[T, R], None]:
+    """
+    Calls fn for every item with at most concurrency calls in flight and yields results as they are ready,
+    in input order if ordered, otherwise in completion order. Items are pulled from the input lazily,
+    so memory use doesn't depend on the input size. Errors are reported per item and don't stop the run.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be positive")
+    source = _aiter(items)
+    running: Dict["asyncio.Future[R]", Tuple[int, T]] = {}
+    ready: Dict[int, BulkResult[T, R]] = {}
+    # ordered results wait for slow predecessors, window bounds how far ahead calls may run
+    window = concurrency * 2 if ordered else concurrency
+    pulled = emitted = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(running) < concurrency and pulled - emitted < window:
+                try:
+                    item = await source.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                running[asyncio.ensure_future(fn(item))] = (pulled, item)
+                pulled += 1
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, item = running.pop(task)
+                result = _result(task, index, item)
+                if ordered:
+                    ready[index] = result
+                else:
+                    emitted += 1
+                    yield result
+            while emitted in ready:
+                yield ready.pop(emitted)
+                emitted += 1
+    finally:
+        for task in running:
+            task.cancel()
+        await source.aclose()
+
+
+async def collect_bulk(
+    fn: Callable[[T], Awaitable[R]],
+    items: Union[Iterable[T], AsyncIterable[T]],
+    concurrency: int = 10,
+) -> List[BulkResult[T, R]]:
+    """
+    Same as run_bulk, but returns all results in input order.
+    """
+    return [result async for result in run_bulk(fn, items, concurrency)]
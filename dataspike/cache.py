@@ -0,0 +1,129 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Mapping, Optional, Set
+
+__all__ = ["CacheConfig", "ResponseCache"]
+
+
+def _default_ttl() -> Dict[str, float]:
+    return {"applicants": 30.0, "verifications": 30.0, "aml": 3600.0}
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    """
+    :param max_entries: number of cached responses, least recently used ones are evicted
+    :param ttl: seconds a response is fresh per endpoint family (applicants, verifications, aml),
+        families without ttl aren't cached
+    :param terminal_verification_ttl: seconds a verified or failed verification is fresh
+    """
+
+    max_entries: int = 1024
+    ttl: Mapping[str, float] = field(default_factory=_default_ttl)
+    terminal_verification_ttl: float = 86400.0
+
+
+class CacheEntry:
+    __slots__ = ["value", "expires_at", "etag", "last_modified", "tags"]
+
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        tags: FrozenSet[str],
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.tags = tags
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """
+        Conditional request headers, empty if server didn't provide validators.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of decoded responses shared by all resources of Api.
+    Entries are tagged with ids of entities they contain to be invalidated on writes.
+    Stale entries with validators are kept to revalidate them with conditional requests.
+    """
+
+    def __init__(self, config: Optional[CacheConfig] = None):
+        self.config = config or CacheConfig()
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl(self, family: str) -> Optional[float]:
+        return self.config.ttl.get(family)
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        self.pop(key)
+        entry = CacheEntry(value, time.monotonic() + ttl, etag, last_modified, frozenset(tags))
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.config.max_entries:
+            self.pop(next(iter(self._entries)))
+
+    def touch(self, key: Hashable, ttl: float) -> None:
+        """
+        Extends freshness of revalidated entry.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expires_at = time.monotonic() + ttl
+
+    def pop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate(self, tag: str) -> None:
+        """
+        Drops all entries tagged with tag, e.g. id of deleted applicant.
+        """
+        for key in list(self._tags.get(tag, ())):
+            self.pop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
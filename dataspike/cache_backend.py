@@ -0,0 +1,221 @@
+import abc
+import asyncio
+import os
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Mapping, Optional, Tuple, TypeVar, Union
+
+__all__ = ["CacheBackend", "SQLiteCacheBackend"]
+
+T = TypeVar("T")
+
+
+class CacheBackend(abc.ABC):
+    """
+    Storage of serialized entities keyed by id, e.g. AML entities keyed by uuid.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    @abc.abstractmethod
+    async def set_many(self, items: Mapping[str, bytes], ttl: Optional[float] = None) -> None: ...
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abc.abstractmethod
+    async def clear(self) -> None: ...
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self.set_many({key: value}, ttl)
+
+    async def close(self) -> None:  # noqa: B027
+        # optional hook, backends holding connections or files release them here
+        pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+-- totals of entries kept by triggers, so writes don't scan the table to decide on eviction
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    entries INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM entries
+WHERE NOT EXISTS (SELECT 1 FROM totals);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET entries = entries + 1, bytes = bytes + new.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET entries = entries - 1, bytes = bytes - old.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes - old.size + new.size;
+END;
+"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    SQLite database on disk which can be shared by many processes on one host.
+    Values are zlib compressed, expired entries are dropped and least recently used ones are evicted
+    when the database exceeds max_entries or max_bytes.
+    A small in-process LRU sits in front of the database, warm() fills it at startup.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        ttl: float = 86400.0,
+        max_entries: int = 100_000,
+        max_bytes: Optional[int] = None,
+        memory_entries: int = 1024,
+        compress_level: int = 1,
+    ):
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.compress_level = compress_level
+        self._memory: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        # sqlite connection is used from one worker thread only
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dataspike-cache")
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # rows replaced by INSERT OR REPLACE fire delete triggers only with recursive triggers on
+            conn.execute("PRAGMA recursive_triggers=ON")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _remember(self, key: str, value: bytes, expires_at: float) -> None:
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        cached = self._memory.get(key)
+        if cached is not None:
+            if cached[1] > now:
+                self._memory.move_to_end(key)
+                return cached[0]
+            del self._memory[key]
+        row = await self._run(self._get, key, now)
+        if row is None:
+            return None
+        value = zlib.decompress(row[0])
+        self._remember(key, value, row[1])
+        return value
+
+    def _get(self, key: str, now: float) -> Optional[Tuple[bytes, float]]:
+        conn = self._connect()
+        row = conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0], row[1]
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: Optional[float] = None) -> None:
+        if not items:
+            return
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        rows = []
+        for key, value in items.items():
+            self._remember(key, value, expires_at)
+            packed = zlib.compress(value, self.compress_level)
+            rows.append((key, packed, len(packed), expires_at, now))
+        await self._run(self._set_many, rows, now)
+
+    def _set_many(self, rows: list, now: float) -> None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", rows)
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        count, size = conn.execute("SELECT entries, bytes FROM totals").fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+        if self.max_bytes is not None and size > self.max_bytes:
+            excess = size - self.max_bytes
+            freed = 0
+            keys = []
+            for key, entry_size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+                if freed >= excess:
+                    break
+                keys.append((key,))
+                freed += entry_size
+            conn.executemany("DELETE FROM entries WHERE key = ?", keys)
+
+    async def delete(self, key: str) -> None:
+        self._memory.pop(key, None)
+        await self._run(self._execute, "DELETE FROM entries WHERE key = ?", (key,))
+
+    async def clear(self) -> None:
+        self._memory.clear()
+        await self._run(self._execute, "DELETE FROM entries", ())
+
+    def _execute(self, query: str, params: tuple) -> None:
+        self._connect().execute(query, params)
+
+    async def warm(self, limit: Optional[int] = None) -> int:
+        """
+        Loads most recently used entries into memory, returns number of loaded entries.
+        """
+        rows = await self._run(self._recent, limit or self.memory_entries, time.time())
+        for key, value, expires_at in reversed(rows):
+            self._remember(key, zlib.decompress(value), expires_at)
+        return len(rows)
+
+    def _recent(self, limit: int, now: float) -> list:
+        return (
+            self._connect()
+            .execute(
+                "SELECT key, value, expires_at FROM entries WHERE expires_at > ? ORDER BY accessed_at DESC LIMIT ?",
+                (now, limit),
+            )
+            .fetchall()
+        )
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+import os
+import sys
+from typing import List, Optional
+
+from .dataspike import Api
+from .export import EXPORT_FORMATS, ExportStats
+
+__all__ = ["main"]
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="dataspike", description="Dataspike API command line tools")
+    parser.add_argument(
+        "--token", default=os.environ.get("DATASPIKE_API_TOKEN"), help="defaults to $DATASPIKE_API_TOKEN"
+    )
+    parser.add_argument("--endpoint", default=os.environ.get("DATASPIKE_API_ENDPOINT", "https://api.dataspike.io"))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="export all verifications or applicants into a file")
+    export.add_argument("resource", choices=["verifications", "applicants"])
+    export.add_argument("path", help="output file, format and compression are guessed from extension, e.g. out.csv.gz")
+    export.add_argument("--format", choices=EXPORT_FORMATS)
+    export.add_argument("--compression", default="auto", help='"gzip", "none" or parquet codec, default by extension')
+    export.add_argument("--limit", type=int, default=100, help="page size")
+    export.add_argument("--prefetch", type=int, default=2, help="pages requested ahead")
+    return parser
+
+
+def _report(stats: ExportStats) -> None:
+    sys.stderr.write(f"\r{stats.rows} rows, {stats.pages} pages, {stats.rows_per_second:.0f} rows/s")
+    sys.stderr.flush()
+
+
+async def _export(args: argparse.Namespace) -> ExportStats:
+    async with Api(args.token, args.endpoint) as api:
+        resource = api.verification if args.resource == "verifications" else api.applicant
+        return await resource.export(
+            args.path,
+            format=args.format,
+            compression=None if args.compression == "none" else args.compression,
+            limit=args.limit,
+            prefetch=args.prefetch,
+            progress=_report,
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    if not args.token:
+        sys.stderr.write("API token is required, pass --token or set DATASPIKE_API_TOKEN\n")
+        return 2
+    stats = asyncio.run(_export(args))
+    sys.stderr.write(f"\nexported {stats.rows} rows in {stats.elapsed:.1f}s, {stats.rows_per_second:.0f} rows/s\n")
+    return 0
@@ -1,14 +1,21 @@
-import json
 from types import TracebackType
-from typing import Optional, Type, Any
+from typing import Dict, Optional, Type, Any, Union
 
-from aiohttp import ClientSession
+from aiohttp import BaseConnector, ClientSession
 
 from .applicants.applicants import Applicants
 from .documents.documents import Documents
 from .verifications.verifications import Verifications
 from .aml.aml import AML
-from .utils import DataspikeJsonEncoder
+from .pool import PoolConfig
+from .breaker import CircuitBreaker
+from .cache import CacheConfig, ResponseCache
+from .cache_backend import CacheBackend
+from .hedging import Hedger, HedgingPolicy
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, DEFAULT_RETRY_POLICY
+from .json_backend import JsonBackend, get_json_backend
+from .trusted import VALIDATION_MODES
 
 __all__ = ["Api"]
 
@@ -16,27 +23,83 @@ from .__version__ import __version__
 
 
 class Api:
-    @staticmethod
-    def _encode_json(obj: Any) -> str:
-        return json.dumps(obj, cls=DataspikeJsonEncoder)
-
-    def __init__(self, api_token: str, api_endpoint: str = "https://api.dataspike.io", **kwargs):
+    def __init__(
+        self,
+        api_token: str,
+        api_endpoint: str = "https://api.dataspike.io",
+        pool: Optional[PoolConfig] = None,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY_POLICY,
+        limiter: Optional[RateLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        single_flight: bool = True,
+        cache: Optional[CacheConfig] = None,
+        aml_cache: Optional[CacheBackend] = None,
+        json: Union[str, JsonBackend] = "auto",
+        validation: str = "strict",
+        **kwargs,
+    ):
         """
         :param api_token: Organization API token
         :param api_endpoint: API endpoint, default "https://api.dataspike.io"
+        :param pool: connection pool settings, can't be combined with connector kwarg
+        :param retry: retry policy for idempotent requests, None disables retries
+        :param limiter: client side rate limiter shared by all resources
+        :param breaker: circuit breaker failing fast calls to unhealthy endpoints
+        :param hedging: hedging policy for GET requests, disabled by default
+        :param single_flight: coalesce concurrent identical GET requests into one
+        :param cache: response cache settings for entity reads, disabled by default
+        :param aml_cache: persistent storage of AML entities, e.g. SQLiteCacheBackend, Api doesn't close it
+        :param json: json backend name ("auto", "orjson", "stdlib") or JsonBackend instance,
+            "auto" uses orjson when it's installed
+        :param validation: "strict" validates call arguments and responses, "trusted" skips argument validation
+            and constructs response models without validation, use it only with well typed callers
         :param kwargs: aiottp.ClientSession params, pass here timeouts or other options
         """
+        if validation not in VALIDATION_MODES:
+            raise ValueError(f"unknown validation mode {validation}")
+        if pool is not None:
+            if "connector" in kwargs:
+                raise ValueError("pool and connector are mutually exclusive")
+            kwargs["connector"] = pool.connector()
 
         self.api_endpoint = api_endpoint
         default_headers = {
             "ds-api-token": api_token,
             "User-Agent": f"dataspike-python/{__version__}",
         }
-        self._session = ClientSession(headers=default_headers, json_serialize=self._encode_json, **kwargs)
-        self.applicant: Applicants = Applicants(self._session, api_endpoint)
-        self.verification = Verifications(self._session, api_endpoint)
-        self.document = Documents(self._session, api_endpoint)
-        self.aml = AML(self._session, api_endpoint)
+        self.json = get_json_backend(json)
+        self._session = ClientSession(headers=default_headers, json_serialize=self.json.dumps, **kwargs)
+        self.cache = ResponseCache(cache) if cache is not None else None
+        options: Dict[str, Any] = {
+            "retry": retry,
+            "limiter": limiter,
+            "breaker": breaker,
+            "hedger": Hedger(hedging) if hedging is not None else None,
+            "single_flight": single_flight,
+            "cache": self.cache,
+            "json": self.json,
+            "validation": validation,
+        }
+        self.applicant: Applicants = Applicants(self._session, api_endpoint, **options)
+        self.verification = Verifications(self._session, api_endpoint, **options)
+        self.document = Documents(self._session, api_endpoint, **options)
+        self.aml = AML(self._session, api_endpoint, entity_cache=aml_cache, **options)
+
+    @classmethod
+    def from_connector(
+        cls, api_token: str, connector: BaseConnector, api_endpoint: str = "https://api.dataspike.io", **kwargs
+    ) -> "Api":
+        """
+        Creates Api on top of a shared connector, e.g. one warmed pool for many organization tokens.
+        The connector isn't closed with Api, the caller owns it.
+
+        :param api_token: Organization API token
+        :param connector: aiohttp connector shared between Api instances
+        :param api_endpoint: API endpoint, default "https://api.dataspike.io"
+        :param kwargs: aiottp.ClientSession params
+        """
+        return cls(api_token, api_endpoint, connector=connector, connector_owner=False, **kwargs)
 
     def __repr__(self) -> str:
         return f"DataspikeApi<{self.api_endpoint}>"
@@ -1,15 +1,171 @@
-from typing import Optional, Union
+import asyncio
+import inspect
+import os
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterable, AsyncIterator, BinaryIO, Iterable, List, Optional, Tuple, Union
 from uuid import UUID
 import filetype
 
 from aiohttp import FormData, ClientResponse
 from pydantic import validate_call
 
-from .model import DocumentSide, DocumentType, Document
+from .download import ResumableDownload
+from .model import DocumentSide, DocumentType, Document, DocumentInfo
+from ..bulk import BulkResult, collect_bulk
 from ..resource import Resource
 
+__all__ = ["Documents", "DocumentStream", "NewDocument"]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# enough for signatures of all formats filetype knows
+SNIFF_SIZE = 8192
+
+# (document_type, file) or (document_type, file, document_side), file as accepted by Documents.upload
+NewDocument = Union[Tuple[DocumentType, Any], Tuple[DocumentType, Any, Optional[DocumentSide]]]
+
+# object with write(bytes) method, write may be a coroutine, drain() is awaited if present
+Writer = Any
+
+
+def _document_type(response: ClientResponse) -> Optional[DocumentType]:
+    try:
+        return DocumentType(response.headers.get("X-Document-Type"))
+    except ValueError:
+        return None
+
+
+class DocumentStream:
+    """
+    Document being downloaded.
+    """
+
+    def __init__(self, response: ClientResponse, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._response = response
+        self._chunk_size = chunk_size
+        self.content_type: Optional[str] = response.headers.get("Content-Type")
+        self.document_type = _document_type(response)
+        self.content_length: Optional[int] = response.content_length
+
+    def iter_chunks(self) -> AsyncIterator[bytes]:
+        return self._response.content.iter_chunked(self._chunk_size)
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.iter_chunks()
+
+    def __repr__(self) -> str:
+        return f"DocumentStream<{self.content_type}, {self.document_type}, {self.content_length} bytes>"
+
+
+async def _copy(document: DocumentStream, writer: Writer) -> int:
+    size = 0
+    drain = getattr(writer, "drain", None)
+    async for chunk in document.iter_chunks():
+        written = writer.write(chunk)
+        if inspect.isawaitable(written):
+            await written
+        if drain is not None:
+            await drain()
+        size += len(chunk)
+    return size
+
+
+async def _save(document: DocumentStream, path: Union[str, "os.PathLike[str]"]) -> int:
+    loop = asyncio.get_running_loop()
+    part = f"{os.fspath(path)}.part"
+    size = 0
+    # disk writes run in executor to keep event loop responsive under many concurrent downloads
+    f = await loop.run_in_executor(None, open, part, "wb")
+    try:
+        try:
+            async for chunk in document.iter_chunks():
+                await loop.run_in_executor(None, f.write, chunk)
+                size += len(chunk)
+        finally:
+            await loop.run_in_executor(None, f.close)
+    except BaseException:
+        # partial file is useless without resume state, unlike download_resumable
+        with suppress(OSError):
+            os.remove(part)
+        raise
+    os.replace(part, path)
+    return size
+
+
+def _sniff(head: bytes) -> Optional[str]:
+    kind = filetype.guess(head[:SNIFF_SIZE])
+    return kind.mime if kind else None
+
+
+async def _chain(head: bytes, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    if head:
+        yield head
+    async for chunk in rest:
+        yield chunk
+
+
+async def _read_head(chunks: AsyncIterator[bytes]) -> bytes:
+    head = bytearray()
+    async for chunk in chunks:
+        head += chunk
+        if len(head) >= SNIFF_SIZE:
+            break
+    return bytes(head)
+
+
+async def _iter_file(f: BinaryIO) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    while True:
+        chunk = await loop.run_in_executor(None, f.read, DEFAULT_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _filename(file: Any) -> str:
+    name = file if isinstance(file, os.PathLike) else getattr(file, "name", None)
+    if isinstance(name, (str, os.PathLike)):
+        return os.path.basename(name) or "file"
+    return "file"
+
+
+@asynccontextmanager
+async def _upload_body(file: Any) -> AsyncIterator[Tuple[Any, Optional[str]]]:
+    """
+    Yields multipart payload for file and its MIME type sniffed from the first SNIFF_SIZE bytes.
+    """
+    loop = asyncio.get_running_loop()
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        yield file, _sniff(bytes(file[:SNIFF_SIZE]))
+    elif isinstance(file, os.PathLike):
+        f = await loop.run_in_executor(None, open, file, "rb")
+        try:
+            head = await loop.run_in_executor(None, f.read, SNIFF_SIZE)
+            await loop.run_in_executor(None, f.seek, 0)
+            # aiohttp streams file objects in chunks reading them in executor
+            yield f, _sniff(head)
+        finally:
+            await loop.run_in_executor(None, f.close)
+    elif hasattr(file, "read"):
+        if getattr(file, "seekable", lambda: False)():
+            position = file.tell()
+            head = file.read(SNIFF_SIZE)
+            file.seek(position)
+            yield file, _sniff(head)
+        else:
+            # consumed head is sent first
+            head = file.read(SNIFF_SIZE)
+            yield _chain(head, _iter_file(file)), _sniff(head)
+    elif isinstance(file, AsyncIterable):
+        chunks = file.__aiter__()
+        head = await _read_head(chunks)
+        yield _chain(head, chunks), _sniff(head)
+    else:
+        yield file, None
+
 
 class Documents(Resource):
+    _family = "documents"
+
     async def _upload(
         self,
         upload_to: Union[UUID, str],
@@ -22,23 +178,16 @@ class Documents(Resource):
         Use DocumentType with side DocumentType.IdCardFront for example
         or pass document_side parameter.
         """
-        data = FormData()
-        content_type = None
-        try:
-            ftype = filetype.guess(file)
-            if ftype:
-                content_type = ftype.mime
-        except TypeError:
-            pass
-
-        data.add_field("file", file, content_type=content_type)
-        data.add_field("document_type", document_type)
-        if document_side:
-            data.add_field("side", document_side)
-        async with self._session.post(url=f"{self._api_endpoint}/api/v3/upload/{upload_to}", data=data) as response:
-            await self._validate_resp(response, [200, 201], "upload document")
-            data = await response.json()
-            return UUID(data["document_id"])
+        async with _upload_body(file) as (body, content_type):
+            data = FormData()
+            data.add_field("file", body, content_type=content_type, filename=_filename(file))
+            data.add_field("document_type", document_type)
+            if document_side:
+                data.add_field("side", document_side)
+            async with self._request("POST", "/api/v3/upload/{}", upload_to, data=data) as response:
+                await self._validate_resp(response, [200, 201], "upload document")
+                result = await self._read_json(response)
+        return UUID(result["document_id"])
 
     @validate_call
     async def upload(
@@ -52,9 +201,33 @@ class Documents(Resource):
         Uploads document for applicant.
         Use DocumentType with side DocumentType.IdCardFront for example
         or pass document_side parameter.
+        :param file: bytes, pathlib.Path, binary file object or async iterable of bytes,
+            files and iterables are streamed without reading them into memory
         """
         return await self._upload(applicant_id, document_type, file, document_side)
 
+    async def upload_many(
+        self, applicant_id: UUID, documents: Iterable[NewDocument], concurrency: int = 4
+    ) -> List[BulkResult[NewDocument, UUID]]:
+        """
+        Uploads several documents of one applicant concurrently, e.g. both sides of id card and a selfie,
+        so total time is close to the slowest upload rather than the sum of all.
+        Returns a result with document id or error per input item in input order.
+
+            results = await api.document.upload_many(applicant_id, [
+                (DocumentType.IdCardFront, front_path),
+                (DocumentType.IdCardBack, back_path),
+                (DocumentType.Selfie, selfie_bytes),
+            ])
+            document_ids = [r.unwrap() for r in results]
+        """
+
+        async def upload(item: NewDocument) -> UUID:
+            document_type, file, *side = item
+            return await self.upload(applicant_id, document_type, file, side[0] if side else None)
+
+        return await collect_bulk(upload, documents, concurrency)
+
     @validate_call
     async def _sdk_upload(
         self,
@@ -71,22 +244,80 @@ class Documents(Resource):
 
     @staticmethod
     async def __get_document(response: ClientResponse) -> Document:
-        content_type = response.headers.get("Content-Type")
-        try:
-            document_type = DocumentType(response.headers.get("X-Document-Type"))
-        except ValueError:
-            document_type = None
         content = await response.read()
-        return Document(content=content, content_type=content_type, document_type=document_type)
+        return Document(
+            content=content, content_type=response.headers.get("Content-Type"), document_type=_document_type(response)
+        )
 
     @validate_call
     async def download(self, document_id: UUID) -> Document:
-        async with self._session.get(url=f"{self._api_endpoint}/api/v3/documents/{document_id}") as response:
+        async with self._request("GET", "/api/v3/documents/{}", document_id, idempotent=True) as response:
             await self._validate_resp(response, [200], "download document")
             return await self.__get_document(response)
 
     @validate_call
     async def download_preview(self, document_id: UUID) -> Document:
-        async with self._session.get(url=f"{self._api_endpoint}/api/v3/documents/{document_id}/preview") as response:
+        async with self._request("GET", "/api/v3/documents/{}/preview", document_id, idempotent=True) as response:
             await self._validate_resp(response, [200], "download document preview")
             return await self.__get_document(response)
+
+    @asynccontextmanager
+    async def stream(
+        self, document_id: UUID, preview: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[DocumentStream]:
+        """
+        Opens document download, headers are available right away and body is read chunk by chunk.
+
+            async with api.document.stream(document_id) as document:
+                print(document.content_type, document.document_type)
+                async for chunk in document.iter_chunks():
+                    ...
+        """
+        path = "/api/v3/documents/{}/preview" if preview else "/api/v3/documents/{}"
+        op = "download document preview" if preview else "download document"
+        async with self._request("GET", path, document_id, idempotent=True) as response:
+            await self._validate_resp(response, [200], op)
+            yield DocumentStream(response, chunk_size)
+
+    async def download_to(
+        self,
+        document_id: UUID,
+        target: Union[str, "os.PathLike[str]", Writer],
+        preview: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> DocumentInfo:
+        """
+        Downloads document into a file or writer without keeping it in memory.
+        Files are written to "<path>.part" and renamed when download completes.
+        :param target: file path or object with write method, sync or async, e.g. opened file
+        """
+        async with self.stream(document_id, preview, chunk_size) as document:
+            if isinstance(target, (str, os.PathLike)):
+                size = await _save(document, target)
+            else:
+                size = await _copy(document, target)
+        return DocumentInfo(size=size, document_type=document.document_type, content_type=document.content_type)
+
+    async def download_resumable(
+        self,
+        document_id: UUID,
+        path: Union[str, "os.PathLike[str]"],
+        preview: bool = False,
+        parallel: int = 1,
+        min_range_size: int = 4 * 1024 * 1024,
+        max_attempts: int = 5,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> DocumentInfo:
+        """
+        Downloads document into path continuing interrupted transfers with Range requests.
+        Partial data is kept in "<path>.part" with progress in "<path>.part.json", so a later call for
+        the same path picks up where the previous one stopped. Completed file is checked against
+        Content-Length and Repr-Digest, Digest or Content-MD5 headers, DocumentIntegrityError is raised on mismatch.
+        :param parallel: number of ranges fetched concurrently, used only when server accepts ranges
+        :param min_range_size: smallest range worth a separate request
+        :param max_attempts: attempts per range when connection drops in the middle of body
+        """
+        download = ResumableDownload(
+            self, document_id, path, preview, parallel, min_range_size, max_attempts, chunk_size
+        )
+        return await download.run()
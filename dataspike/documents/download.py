@@ -0,0 +1,295 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import re
+from typing import TYPE_CHECKING, Any, Awaitable, BinaryIO, Dict, List, Optional, Union
+from uuid import UUID
+
+from aiohttp import ClientConnectionError, ClientPayloadError, ClientResponse
+
+from .model import DocumentInfo, DocumentType
+from ..errors import DocumentIntegrityError
+from ..retry import RetryPolicy
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..resource import Resource
+
+__all__ = ["ResumableDownload"]
+
+# bytes written between saves of download state
+_SAVE_EVERY = 1024 * 1024
+_HASHES = {"sha-256": "sha256", "sha-512": "sha512", "md5": "md5"}
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+class _Changed(Exception):
+    """
+    Document changed since the partial file was started, download begins anew.
+    """
+
+
+def _checksum(response: ClientResponse) -> Optional[List[str]]:
+    """
+    Expected [algorithm, base64 digest] of the whole document, if server provided one.
+    """
+    # Repr-Digest describes the whole document even in partial responses
+    for header, full_only in (("Repr-Digest", False), ("Digest", True), ("Content-MD5", True)):
+        value = response.headers.get(header)
+        if not value or (full_only and response.status != 200):
+            continue
+        if header == "Content-MD5":
+            return ["md5", value.strip()]
+        for item in value.split(","):
+            algorithm, _, digest = item.strip().partition("=")
+            algorithm = algorithm.lower()
+            if algorithm in _HASHES and digest:
+                return [algorithm, digest.strip(":")]
+    return None
+
+
+def _split(size: int, parts: int) -> List[List[Any]]:
+    step = -(-size // parts)
+    return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+
+async def _gather(*coros: Awaitable[None]) -> None:
+    """
+    Runs range downloads, if one of them fails the rest are cancelled.
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class ResumableDownload:
+    """
+    Download into "<path>.part" with progress kept in "<path>.part.json". Interrupted transfers continue
+    with Range requests from the last written byte, within the same call and in later calls for the same path.
+    The completed file is checked against the document length and checksum headers before it's renamed to path.
+    """
+
+    def __init__(
+        self,
+        resource: "Resource",
+        document_id: UUID,
+        path: Union[str, "os.PathLike[str]"],
+        preview: bool = False,
+        parallel: int = 1,
+        min_range_size: int = 4 * 1024 * 1024,
+        max_attempts: int = 5,
+        chunk_size: int = 64 * 1024,
+    ):
+        self._resource = resource
+        self._preview = preview
+        self._url_path = "/api/v3/documents/{}/preview" if preview else "/api/v3/documents/{}"
+        self._op = "download document preview" if preview else "download document"
+        self._document_id = document_id
+        self.path = os.fspath(path)
+        self.part = f"{self.path}.part"
+        self.state_path = f"{self.part}.json"
+        self._parallel = max(1, parallel)
+        self._min_range_size = min_range_size
+        self._max_attempts = max_attempts
+        # connection drops mid body are retried here, resource retry policy covers failed requests
+        self._retry = resource._retry or RetryPolicy()
+        self._chunk_size = chunk_size
+        self._state: Dict[str, Any] = {}
+        self._state_lock = asyncio.Lock()
+
+    async def run(self) -> DocumentInfo:
+        loop = asyncio.get_running_loop()
+        state = await loop.run_in_executor(None, self._load)
+        for _ in range(2):
+            try:
+                if state is None:
+                    await self._start()
+                else:
+                    self._state = state
+                    await _gather(*(self._fill(i) for i in range(len(state["ranges"]))))
+                break
+            except _Changed:
+                await loop.run_in_executor(None, self._discard)
+                state = None
+            except BaseException:
+                # keep progress for the next call
+                if self._state:
+                    self._write_state(json.dumps(self._state))
+                raise
+        else:
+            raise DocumentIntegrityError(self.path, "document keeps changing during download")
+        await loop.run_in_executor(None, self._verify)
+        os.replace(self.part, self.path)
+        await loop.run_in_executor(None, os.remove, self.state_path)
+        state = self._state
+        try:
+            document_type: Optional[DocumentType] = DocumentType(state["document_type"])
+        except ValueError:
+            document_type = None
+        return DocumentInfo(size=state["size"], document_type=document_type, content_type=state.get("content_type"))
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self.part):
+            return None
+        # the path may be reused for another document, without ETag nothing else tells them apart
+        if state.get("document_id") != str(self._document_id) or state.get("preview") != self._preview:
+            return None
+        return state
+
+    async def _save(self) -> None:
+        async with self._state_lock:
+            data = json.dumps(self._state)
+            await asyncio.get_running_loop().run_in_executor(None, self._write_state, data)
+
+    def _write_state(self, data: str) -> None:
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(data)
+        os.replace(tmp, self.state_path)
+
+    def _discard(self) -> None:
+        for path in (self.part, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def _start(self) -> None:
+        async with self._resource._request("GET", self._url_path, self._document_id, idempotent=True) as response:
+            await self._resource._validate_resp(response, [200], self._op)
+            size = response.content_length
+            ranges = [[0, size - 1 if size is not None else None, 0]]
+            parts = min(self._parallel, (size or 0) // self._min_range_size)
+            if parts > 1 and response.headers.get("Accept-Ranges") == "bytes":
+                ranges = _split(size, parts)  # type: ignore[arg-type]
+            self._state = {
+                "document_id": str(self._document_id),
+                "preview": self._preview,
+                "size": size,
+                "etag": response.headers.get("ETag"),
+                "checksum": _checksum(response),
+                "content_type": response.headers.get("Content-Type"),
+                "document_type": response.headers.get("X-Document-Type"),
+                "ranges": ranges,
+            }
+            await asyncio.get_running_loop().run_in_executor(None, self._create_part)
+            await self._save()
+            # the first response feeds the first range, the rest are requested separately
+            await _gather(self._fill(0, response), *(self._fill(i) for i in range(1, len(ranges))))
+
+    def _open_part(self) -> BinaryIO:
+        return open(self.part, "r+b")
+
+    def _create_part(self) -> None:
+        with open(self.part, "wb") as f:
+            if self._state["size"]:
+                f.truncate(self._state["size"])
+
+    async def _fill(self, index: int, response: Optional[ClientResponse] = None) -> None:
+        attempt = 0
+        while True:
+            start, end, done = self._state["ranges"][index]
+            if end is not None and start + done > end:
+                return
+            try:
+                if response is not None:
+                    await self._write(index, response)
+                else:
+                    headers = {"Range": f"bytes={start + done}-{'' if end is None else end}"}
+                    if self._state["etag"]:
+                        headers["If-Range"] = self._state["etag"]
+                    async with self._resource._request(
+                        "GET", self._url_path, self._document_id, idempotent=True, headers=headers
+                    ) as response:
+                        await self._accept(index, response)
+                        await self._write(index, response)
+                if end is None:
+                    self._state["size"] = self._state["ranges"][index][2]
+                    self._state["ranges"][index][1] = self._state["size"] - 1
+                await self._save()
+                return
+            except (ClientPayloadError, ClientConnectionError, asyncio.TimeoutError):
+                await self._save()
+                attempt += 1
+                if attempt >= self._max_attempts:
+                    raise
+                await asyncio.sleep(self._retry.backoff(attempt - 1))
+            finally:
+                response = None
+
+    async def _accept(self, index: int, response: ClientResponse) -> None:
+        """
+        Checks that the response continues the range, raises _Changed if the document was replaced.
+        """
+        start, _, done = self._state["ranges"][index]
+        if response.status == 416:
+            raise _Changed()
+        if response.status == 200:
+            # server ignored Range or If-Range didn't match, document was replaced
+            raise _Changed()
+        await self._resource._validate_resp(response, [206], self._op)
+        match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+        if match is None or int(match.group(1)) != start + done:
+            raise _Changed()
+        total = None if match.group(3) == "*" else int(match.group(3))
+        if self._state["size"] is None:
+            self._state["size"] = total
+        elif total is not None and total != self._state["size"]:
+            raise _Changed()
+        if self._state["checksum"] is None:
+            self._state["checksum"] = _checksum(response)
+
+    async def _write(self, index: int, response: ClientResponse) -> None:
+        loop = asyncio.get_running_loop()
+        rng = self._state["ranges"][index]
+        # rng[2] counts flushed bytes only, saves of other ranges may persist it at any moment
+        written = rng[2]
+        f = await loop.run_in_executor(None, self._open_part)
+        try:
+            await loop.run_in_executor(None, f.seek, rng[0] + written)
+            unsaved = 0
+            async for chunk in response.content.iter_chunked(self._chunk_size):
+                if rng[1] is not None:
+                    chunk = chunk[: rng[1] + 1 - rng[0] - written]
+                await loop.run_in_executor(None, f.write, chunk)
+                written += len(chunk)
+                unsaved += len(chunk)
+                if unsaved >= _SAVE_EVERY:
+                    await loop.run_in_executor(None, f.flush)
+                    rng[2] = written
+                    await self._save()
+                    unsaved = 0
+                if rng[1] is not None and rng[0] + written > rng[1]:
+                    break
+        finally:
+            await loop.run_in_executor(None, f.close)
+            # close flushed the rest
+            rng[2] = written
+        if rng[1] is not None and rng[0] + rng[2] <= rng[1]:
+            raise ClientPayloadError("document body ended before the end of range")
+
+    def _verify(self) -> None:
+        size = self._state["size"]
+        actual = os.path.getsize(self.part)
+        if size is not None and actual != size:
+            self._discard()
+            raise DocumentIntegrityError(self.path, f"expected {size} bytes, got {actual}")
+        checksum = self._state["checksum"]
+        if checksum is None:
+            return
+        algorithm, expected = checksum
+        digest = hashlib.new(_HASHES[algorithm])
+        with open(self.part, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        if base64.b64encode(digest.digest()).decode() != expected:
+            self._discard()
+            raise DocumentIntegrityError(self.path, f"{algorithm} checksum mismatch")
@@ -5,7 +5,7 @@ from pydantic.fields import Field
 from ..utils import StrEnum
 from uuid import UUID
 
-__all__ = ["DocumentType", "DocumentSide", "DocumentRef", "Document"]
+__all__ = ["DocumentType", "DocumentSide", "DocumentRef", "Document", "DocumentInfo"]
 
 
 class DocumentType(StrEnum):
@@ -55,3 +55,14 @@ class Document:
             f"DocumentContent(content_type={self.content_type}, "
             f"document_type={self.document_type}, content=<{len(self.content)} bytes>"
         )
+
+
+@dataclass
+class DocumentInfo:
+    """
+    Document saved by Documents.download_to, content isn't kept in memory.
+    """
+
+    size: int
+    document_type: Optional[DocumentType] = Field(default=None)
+    content_type: Optional[str] = Field(default=None)
@@ -8,3 +8,17 @@ class UnexpectedResponseStatus(DataspikeError):
         self.method = method
         self.response = response
         Exception.__init__(self, msg)
+
+
+class CircuitOpenError(DataspikeError):
+    def __init__(self, endpoint, retry_in):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        Exception.__init__(self, f"circuit for {endpoint} is open, next probe in {retry_in:.1f}s")
+
+
+class DocumentIntegrityError(DataspikeError):
+    def __init__(self, path, reason):
+        self.path = path
+        self.reason = reason
+        Exception.__init__(self, f"downloaded document {path} is corrupted: {reason}")
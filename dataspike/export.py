@@ -0,0 +1,242 @@
+import abc
+import csv
+import dataclasses
+import gzip
+import importlib
+import json
+import os
+import time
+from typing import IO, Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, Union, get_args, get_origin
+from typing import get_type_hints
+
+from .common import PagedResponse
+
+__all__ = ["EXPORT_FORMATS", "ExportStats", "Sink", "NdjsonSink", "CsvSink", "ParquetSink", "open_sink", "write_pages"]
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+
+PathLike = Union[str, "os.PathLike[str]"]
+Row = Dict[str, Any]
+
+
+@dataclasses.dataclass
+class ExportStats:
+    """
+    Progress of running export, passed to progress callback after every page.
+    """
+
+    rows: int = 0
+    pages: int = 0
+    started_at: float = dataclasses.field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class Column:
+    name: str
+    path: Tuple[str, ...]
+    type: Any
+    # lists and free form dicts are stored as json strings
+    as_json: bool = False
+
+
+def _unwrap_optional(tp: Any) -> Any:
+    args = [arg for arg in get_args(tp) if arg is not type(None)]
+    if get_origin(tp) is Union and len(args) == 1:
+        return args[0]
+    return tp
+
+
+def columns(model: type, prefix: Tuple[str, ...] = ()) -> List[Column]:
+    """
+    Flat columns of a model, nested dataclasses are expanded into "checks.liveness.status" like columns.
+    """
+    result = []
+    hints = get_type_hints(model)
+    for field in dataclasses.fields(model):
+        tp = _unwrap_optional(hints[field.name])
+        path = (*prefix, field.name)
+        if isinstance(tp, type) and dataclasses.is_dataclass(tp):
+            result.extend(columns(tp, path))
+        else:
+            as_json = get_origin(tp) is not None or tp in (dict, list)
+            result.append(Column(".".join(path), path, tp, as_json))
+    return result
+
+
+def _extract(row: Row, column: Column, dumps: Callable[[Any], str]) -> Any:
+    value: Any = row
+    for key in column.path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    if column.as_json and value is not None:
+        return dumps(value)
+    return value
+
+
+class Sink(abc.ABC):
+    """
+    Destination of exported rows, rows are raw json objects as returned by API.
+    """
+
+    @abc.abstractmethod
+    def write(self, rows: Sequence[Row]) -> None: ...
+
+    @abc.abstractmethod
+    def close(self) -> None: ...
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _open_text(path: PathLike, compression: Optional[str]) -> IO[str]:
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    if compression is not None:
+        raise ValueError(f"unsupported compression {compression}")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+class NdjsonSink(Sink):
+    def __init__(self, path: PathLike, compression: Optional[str] = None, dumps: Callable[[Any], str] = json.dumps):
+        self._file = _open_text(path, compression)
+        self._dumps = dumps
+
+    def write(self, rows: Sequence[Row]) -> None:
+        self._file.write("".join(self._dumps(row) + "\n" for row in rows))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CsvSink(Sink):
+    def __init__(
+        self, path: PathLike, model: type, compression: Optional[str] = None, dumps: Callable[[Any], str] = json.dumps
+    ):
+        self._columns = columns(model)
+        self._file = _open_text(path, compression)
+        self._dumps = dumps
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([c.name for c in self._columns])
+
+    def write(self, rows: Sequence[Row]) -> None:
+        dumps = self._dumps
+        self._writer.writerows([[_extract(row, c, dumps) for c in self._columns] for row in rows])
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _arrow_type(pa: Any, tp: Any) -> Any:
+    if tp is bool:
+        return pa.bool_()
+    if tp is int:
+        return pa.int64()
+    if tp is float:
+        return pa.float64()
+    return pa.string()
+
+
+class ParquetSink(Sink):
+    """
+    Every written page becomes a row group, requires pyarrow.
+    """
+
+    def __init__(
+        self, path: PathLike, model: type, compression: Optional[str] = "zstd", dumps: Callable[[Any], str] = json.dumps
+    ):
+        try:
+            # optional dependency, loaded only when parquet is written
+            self._pa: Any = importlib.import_module("pyarrow")
+            parquet: Any = importlib.import_module("pyarrow.parquet")
+        except ImportError:
+            raise ImportError("pyarrow is required for parquet export, install dataspike[parquet]") from None
+        self._columns = columns(model)
+        self._schema = self._pa.schema([(c.name, _arrow_type(self._pa, c.type)) for c in self._columns])
+        self._dumps = dumps
+        self._writer = parquet.ParquetWriter(os.fspath(path), self._schema, compression=compression or "none")
+
+    def _cell(self, row: Row, column: Column) -> Any:
+        value = _extract(row, column, self._dumps)
+        if value is None or column.type in (bool, int, float):
+            return value
+        return value if isinstance(value, str) else str(value)
+
+    def write(self, rows: Sequence[Row]) -> None:
+        if not rows:
+            return
+        data = {c.name: [self._cell(row, c) for row in rows] for c in self._columns}
+        self._writer.write_table(self._pa.Table.from_pydict(data, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _guess_format(name: str) -> str:
+    for ext, fmt in ((".ndjson", "ndjson"), (".jsonl", "ndjson"), (".csv", "csv"), (".parquet", "parquet")):
+        if name.endswith(ext):
+            return fmt
+    raise ValueError(f"can't guess export format of {name}, pass format explicitly")
+
+
+def open_sink(
+    path: PathLike,
+    model: type,
+    format: Optional[str] = None,
+    compression: Optional[str] = "auto",
+    dumps: Callable[[Any], str] = json.dumps,
+) -> Sink:
+    """
+    Opens sink for path, format and compression are guessed from extension, e.g. "out.csv.gz".
+    :param compression: "gzip" or None for ndjson and csv, parquet codec name for parquet,
+        "auto" picks gzip for .gz files and zstd for parquet
+    """
+    name = os.fspath(path).lower()
+    gzipped = name.endswith(".gz")
+    if format is None:
+        format = _guess_format(name[:-3] if gzipped else name)
+    if compression == "auto":
+        compression = "zstd" if format == "parquet" else "gzip" if gzipped else None
+    if format == "ndjson":
+        return NdjsonSink(path, compression, dumps)
+    if format == "csv":
+        return CsvSink(path, model, compression, dumps)
+    if format == "parquet":
+        return ParquetSink(path, model, compression, dumps)
+    raise ValueError(f"unknown export format {format}, expected one of {', '.join(EXPORT_FORMATS)}")
+
+
+async def write_pages(
+    pages: AsyncIterator[PagedResponse[Row]],
+    sink: Sink,
+    progress: Optional[Callable[[ExportStats], None]] = None,
+) -> ExportStats:
+    """
+    Writes pages into sink as they arrive and closes it.
+    """
+    stats = ExportStats()
+    try:
+        with sink:
+            async for page in pages:
+                sink.write(page.data)
+                stats.rows += len(page.data)
+                stats.pages += 1
+                if progress is not None:
+                    progress(stats)
+    finally:
+        await pages.aclose()  # type: ignore[attr-defined]
+    stats.finished_at = time.monotonic()
+    return stats
@@ -0,0 +1,67 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+__all__ = ["HedgingPolicy", "Hedger"]
+
+
+@dataclass(frozen=True)
+class HedgingPolicy:
+    """
+    Hedging of GET requests: if a response doesn't arrive in delay, an identical request is sent
+    and the first response wins.
+
+    :param delay: fixed hedging delay in seconds, when None observed latency quantile of the endpoint is used
+    :param quantile: latency quantile used as delay, e.g. 0.95 for p95
+    :param min_samples: observed latencies required before hedging by quantile starts
+    :param window_size: number of last latencies kept per endpoint
+    :param budget_ratio: global cap of hedged requests as a share of all hedgeable requests
+    :param budget_burst: number of hedges that can be spent at once
+    """
+
+    delay: Optional[float] = None
+    quantile: float = 0.95
+    min_samples: int = 20
+    window_size: int = 200
+    budget_ratio: float = 0.1
+    budget_burst: float = 10.0
+
+
+class Hedger:
+    """
+    Shared by all resources of Api so the budget caps extra load globally.
+    """
+
+    def __init__(self, policy: Optional[HedgingPolicy] = None):
+        self.policy = policy or HedgingPolicy()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._budget = self.policy.budget_burst
+        self.hedged = 0
+
+    def track(self) -> None:
+        """
+        Called for every hedgeable request, refills the budget.
+        """
+        self._budget = min(self.policy.budget_burst, self._budget + self.policy.budget_ratio)
+
+    def acquire(self) -> bool:
+        if self._budget < 1:
+            return False
+        self._budget -= 1
+        self.hedged += 1
+        return True
+
+    def observe(self, endpoint: str, latency: float) -> None:
+        window = self._latencies.get(endpoint)
+        if window is None:
+            window = self._latencies[endpoint] = deque(maxlen=self.policy.window_size)
+        window.append(latency)
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        if self.policy.delay is not None:
+            return self.policy.delay
+        window = self._latencies.get(endpoint)
+        if window is None or len(window) < self.policy.min_samples:
+            return None
+        ordered = sorted(window)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.policy.quantile))]
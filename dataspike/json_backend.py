@@ -0,0 +1,104 @@
+import abc
+import json
+from typing import Any, Set, TypeVar, Union
+
+from pydantic import TypeAdapter
+
+from .common import PagedResponse
+from .utils import DataspikeJsonEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+__all__ = ["JsonBackend", "StdlibJsonBackend", "OrjsonBackend", "get_json_backend", "validate_parsed"]
+
+T = TypeVar("T")
+
+# adapters validated from parsed json instead of raw bytes
+_VALIDATE_PARSED: Set[TypeAdapter[Any]] = set()
+
+
+def validate_parsed(adapter: TypeAdapter[T]) -> TypeAdapter[T]:
+    """
+    Marks adapter to be validated from the output of JsonBackend.loads instead of by pydantic's json parser.
+    It's faster for string heavy models such as AMLResponse, see benchmarks/bench_decode.py.
+    Marked adapters are kept alive, meant for module level ones.
+    """
+    _VALIDATE_PARSED.add(adapter)
+    return adapter
+
+
+class JsonBackend(abc.ABC):
+    """
+    Encodes request bodies and decodes response bodies.
+    """
+
+    name = ""
+
+    @abc.abstractmethod
+    def dumps(self, obj: Any) -> str: ...
+
+    @abc.abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any: ...
+
+    def validate(self, adapter: TypeAdapter[T], raw: bytes) -> T:
+        """
+        Decodes response body into model. Pydantic parses json itself unless adapter is marked with validate_parsed.
+        """
+        if adapter in _VALIDATE_PARSED:
+            return adapter.validate_python(self.loads(raw))
+        return adapter.validate_json(raw)
+
+    def __repr__(self) -> str:
+        return f"JsonBackend<{self.name}>"
+
+
+class StdlibJsonBackend(JsonBackend):
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, cls=DataspikeJsonEncoder)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+def _orjson_default(o: Any) -> Any:
+    # UUID, datetime, enums and dataclasses are handled by orjson itself
+    if isinstance(o, PagedResponse):
+        return {"data": list(o.data), "has_next": o.has_next}
+    elif hasattr(o, "__iter__"):
+        return list(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonBackend(JsonBackend):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed, install dataspike[fast]")
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> str:
+        return self._orjson.dumps(obj, default=_orjson_default).decode()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._orjson.loads(data)
+
+
+def get_json_backend(backend: Union[str, JsonBackend] = "auto") -> JsonBackend:
+    """
+    Returns backend by name: "orjson", "stdlib" or "auto" which picks orjson when it's installed.
+    """
+    if isinstance(backend, JsonBackend):
+        return backend
+    if backend == "auto":
+        return OrjsonBackend() if orjson is not None else StdlibJsonBackend()
+    if backend == "orjson":
+        return OrjsonBackend()
+    if backend == "stdlib":
+        return StdlibJsonBackend()
+    raise ValueError(f"unknown json backend {backend}")
@@ -0,0 +1,127 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable, Deque, Optional, Tuple, TypeVar
+
+from .common import PagedResponse
+
+__all__ = ["AdaptiveLimit", "iter_pages", "iter_items"]
+
+T = TypeVar("T")
+
+PageFetcher = Callable[[int, int], Awaitable[PagedResponse[T]]]
+
+
+@dataclass(frozen=True)
+class AdaptiveLimit:
+    """
+    Page size tuning by observed page latency: limit is doubled while pages are faster than half
+    of the target and halved when they're slower than the target.
+
+    :param target_latency: desired seconds per page request
+    :param min_limit: smallest page size
+    :param max_limit: largest page size, keep it within API limits
+    """
+
+    target_latency: float = 1.0
+    min_limit: int = 10
+    max_limit: int = 100
+
+
+class _Cursor:
+    """
+    Position of the next page request. Pages are addressed by number, so limit changes only
+    where offset stays a multiple of the new limit.
+    """
+
+    def __init__(self, page: int, limit: int, adaptive: Optional[AdaptiveLimit]):
+        self.offset = page * limit
+        self.limit = limit
+        self.adaptive = adaptive
+
+    def advance(self) -> Tuple[int, int]:
+        page, limit = self.offset // self.limit, self.limit
+        self.offset += limit
+        return page, limit
+
+    def observe(self, latency: float) -> None:
+        adaptive = self.adaptive
+        if adaptive is None:
+            return
+        limit = self.limit
+        if latency < adaptive.target_latency / 2:
+            limit = min(limit * 2, adaptive.max_limit)
+        elif latency > adaptive.target_latency:
+            limit = max(limit // 2, adaptive.min_limit)
+        if limit != self.limit and self.offset % limit == 0:
+            self.limit = limit
+
+
+async def _timed(fetch: "PageFetcher[T]", page: int, limit: int) -> Tuple[PagedResponse[T], float]:
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = await fetch(page, limit)
+    return result, loop.time() - started
+
+
+async def iter_pages(
+    fetch: "PageFetcher[T]",
+    page: int = 0,
+    limit: int = 10,
+    prefetch: int = 1,
+    adaptive: Optional[AdaptiveLimit] = None,
+) -> AsyncGenerator[PagedResponse[T], None]:
+    """
+    Yields pages returned by fetch(page, limit) until one has no next page.
+    Up to prefetch following pages are requested while the consumer handles the current one,
+    requests past the last page are cancelled or discarded.
+    """
+    if prefetch < 0:
+        raise ValueError("prefetch can't be negative")
+    if adaptive is not None:
+        limit = min(max(limit, adaptive.min_limit), adaptive.max_limit)
+    cursor = _Cursor(page, limit, adaptive)
+    pending: "Deque[asyncio.Future[Tuple[PagedResponse[T], float]]]" = deque()
+
+    def schedule() -> None:
+        pending.append(asyncio.ensure_future(_timed(fetch, *cursor.advance())))
+
+    try:
+        schedule()
+        while pending:
+            result, latency = await pending.popleft()
+            cursor.observe(latency)
+            has_next = result.has_next and len(result.data) > 0
+            if has_next:
+                while len(pending) < prefetch:
+                    schedule()
+            else:
+                _cancel(pending)
+            yield result
+            if has_next and not pending:
+                schedule()
+    finally:
+        _cancel(pending)
+
+
+def _cancel(pending: "Deque[asyncio.Future[Any]]") -> None:
+    while pending:
+        task = pending.popleft()
+        if task.done():
+            if not task.cancelled():
+                # errors of discarded pages aren't interesting
+                task.exception()
+        else:
+            task.cancel()
+
+
+async def iter_items(pages: AsyncIterator[PagedResponse[T]]) -> AsyncGenerator[T, None]:
+    """
+    Flattens pages into items.
+    """
+    try:
+        async for page in pages:
+            for item in page.data:
+                yield item
+    finally:
+        await pages.aclose()  # type: ignore[attr-defined]
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from aiohttp import TCPConnector
+
+__all__ = ["PoolConfig"]
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """
+    Connection pool settings used to build the aiohttp TCPConnector of Api.
+
+    :param limit: total number of simultaneous connections, 0 means unlimited
+    :param limit_per_host: number of simultaneous connections to one host, 0 means unlimited
+    :param keepalive_timeout: seconds an idle connection is kept open for reuse
+    :param ttl_dns_cache: seconds resolved addresses are cached, None caches forever
+    :param use_dns_cache: enable the DNS cache
+    :param happy_eyeballs_delay: RFC 8305 connection attempt delay, None disables happy eyeballs
+    :param interleave: RFC 8305 address family interleave
+    """
+
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 15.0
+    ttl_dns_cache: Optional[int] = 10
+    use_dns_cache: bool = True
+    happy_eyeballs_delay: Optional[float] = 0.25
+    interleave: Optional[int] = None
+
+    def connector(self) -> TCPConnector:
+        """
+        Creates a new connector, must be called with a running event loop.
+        """
+        return TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=self.use_dns_cache,
+            happy_eyeballs_delay=self.happy_eyeballs_delay,
+            interleave=self.interleave,
+        )
@@ -0,0 +1,161 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+
+__all__ = ["RateLimit", "RateLimiter", "TokenBucket", "AdaptiveConcurrency"]
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Budget of one endpoint family.
+
+    :param rate: requests per second
+    :param burst: number of requests that can be sent at once after idle period
+    :param max_concurrency: upper bound of requests in flight, in adaptive mode it's the initial limit
+    """
+
+    rate: float
+    burst: int = 1
+    max_concurrency: int = 64
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        # lock is created lazily to bind it to the running loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AdaptiveConcurrency:
+    """
+    Concurrency limit with additive increase on success and multiplicative decrease on throttling.
+    """
+
+    def __init__(self, limit: int, minimum: int = 1, maximum: Optional[int] = None, decrease: float = 0.5):
+        self.minimum = minimum
+        self.maximum = maximum if maximum is not None else limit
+        self.decrease = decrease
+        self.limit = float(limit)
+        self.in_flight = 0
+        self._generation = 0
+        self._cond: Optional[asyncio.Condition] = None
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def acquire(self) -> int:
+        """
+        Waits for a free slot, returns generation used to ignore stale throttling signals.
+        """
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self.in_flight < max(self.minimum, int(self.limit)))
+            self.in_flight += 1
+            return self._generation
+
+    async def release(self, generation: int, throttled: bool) -> None:
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            if throttled:
+                # requests sent before the previous decrease don't shrink the limit again
+                if generation == self._generation:
+                    self.limit = max(float(self.minimum), self.limit * self.decrease)
+                    self._generation += 1
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            cond.notify_all()
+
+
+class _Slot:
+    __slots__ = ["throttled"]
+
+    def __init__(self) -> None:
+        self.throttled = False
+
+    def record(self, status: int) -> None:
+        self.throttled = status == 429
+
+
+class RateLimiter:
+    """
+    Client side limiter shared by all resources of Api.
+    Each endpoint family (applicants, verifications, documents, aml) has its own budget,
+    families without explicit limit use default one or aren't limited at all.
+    In adaptive mode concurrency of a family shrinks when API responds 429 and grows back on success.
+    """
+
+    def __init__(
+        self,
+        default: Optional[RateLimit] = None,
+        limits: Optional[Dict[str, RateLimit]] = None,
+        adaptive: bool = False,
+        min_concurrency: int = 1,
+    ):
+        self._default = default
+        self._limits = dict(limits or {})
+        self._adaptive = adaptive
+        self._min_concurrency = min_concurrency
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._concurrency: Dict[str, AdaptiveConcurrency] = {}
+
+    def limit_for(self, family: str) -> Optional[RateLimit]:
+        return self._limits.get(family, self._default)
+
+    def bucket(self, family: str) -> Optional[TokenBucket]:
+        limit = self.limit_for(family)
+        if limit is None:
+            return None
+        # families on default budget share one bucket
+        key = family if family in self._limits else ""
+        if key not in self._buckets:
+            self._buckets[key] = TokenBucket(limit.rate, limit.burst)
+            self._concurrency[key] = AdaptiveConcurrency(limit.max_concurrency, minimum=self._min_concurrency)
+        return self._buckets[key]
+
+    def concurrency(self, family: str) -> Optional[AdaptiveConcurrency]:
+        if self.bucket(family) is None:
+            return None
+        return self._concurrency[family if family in self._limits else ""]
+
+    @asynccontextmanager
+    async def slot(self, family: str) -> AsyncIterator[_Slot]:
+        """
+        Holds a token and a concurrency slot for one request of family.
+        """
+        slot = _Slot()
+        bucket = self.bucket(family)
+        concurrency = self.concurrency(family)
+        if bucket is None or concurrency is None:
+            yield slot
+            return
+        generation = await concurrency.acquire()
+        try:
+            await bucket.acquire()
+            yield slot
+        finally:
+            await concurrency.release(generation, self._adaptive and slot.throttled)
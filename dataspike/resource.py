@@ -1,14 +1,271 @@
-from typing import Iterable
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional, Sequence, TypeVar, cast
 
-from aiohttp import ClientResponse, ClientSession
+from aiohttp import ClientConnectionError, ClientResponse, ClientSession
+from pydantic import TypeAdapter
 
+from .breaker import CircuitBreaker
+from .cache import ResponseCache
+from .common import PagedResponse
 from .errors import UnexpectedResponseStatus
+from .hedging import Hedger
+from .json_backend import JsonBackend, StdlibJsonBackend
+from .ratelimit import RateLimiter
+from .retry import RetryEvent, RetryPolicy
+from .singleflight import SingleFlight
+from .trusted import construct, trust_methods
+
+T = TypeVar("T")
 
 
 class Resource:
-    def __init__(self, session: ClientSession, api_endpoint: str):
+    # endpoint family used to pick rate limit budget
+    _family = ""
+
+    def __init__(
+        self,
+        session: ClientSession,
+        api_endpoint: str,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[RateLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedger: Optional[Hedger] = None,
+        single_flight: bool = True,
+        cache: Optional[ResponseCache] = None,
+        json: Optional[JsonBackend] = None,
+        validation: str = "strict",
+    ):
         self._api_endpoint = api_endpoint
         self._session = session
+        self._retry = retry
+        self._limiter = limiter
+        # rate limiter slots of responses which aren't released yet
+        self._slots: Dict[ClientResponse, AsyncExitStack] = {}
+        self._breaker = breaker
+        self._hedger = hedger
+        self._flight = SingleFlight() if single_flight else None
+        self._cache = cache
+        self._json = json or StdlibJsonBackend()
+        self._trusted = validation == "trusted"
+        if self._trusted:
+            trust_methods(self)
+
+    async def _send_hedged(self, hedger: Hedger, method: str, url: str, endpoint: str, **kwargs: Any) -> ClientResponse:
+        """
+        Sends the request and, if it's slower than hedging delay, an identical one. First successful response wins.
+        """
+        hedger.track()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        tasks = [asyncio.ensure_future(self._send(method, url, endpoint, **kwargs))]
+        winner: Optional[ClientResponse] = None
+        try:
+            delay = hedger.delay(endpoint)
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and hedger.acquire():
+                    tasks.append(asyncio.ensure_future(self._send(method, url, endpoint, **kwargs)))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task in done and task.exception() is None:
+                        winner = task.result()
+                        hedger.observe(endpoint, loop.time() - started)
+                        return winner
+            # all attempts failed, report the primary one
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None and task.result() is not winner:
+                    await self._release(task.result())
+
+    async def _send(self, method: str, url: str, endpoint: str, **kwargs: Any) -> ClientResponse:
+        if self._breaker is None:
+            return await self._send_limited(method, url, **kwargs)
+        token = self._breaker.before(endpoint)
+        success = None
+        try:
+            response = await self._send_limited(method, url, **kwargs)
+            success = response.status < 500
+            return response
+        except (ClientConnectionError, asyncio.TimeoutError):
+            success = False
+            raise
+        finally:
+            self._breaker.record(endpoint, success, token)
+
+    async def _send_limited(self, method: str, url: str, **kwargs: Any) -> ClientResponse:
+        if self._limiter is None:
+            return await self._session.request(method, url, **kwargs)
+        async with AsyncExitStack() as stack:
+            slot = await stack.enter_async_context(self._limiter.slot(self._family))
+            response = await self._session.request(method, url, **kwargs)
+            slot.record(response.status)
+            # request is in flight until its body is read, the slot is freed by _release
+            self._slots[response] = stack.pop_all()
+        return response
+
+    async def _release(self, response: ClientResponse) -> None:
+        response.release()
+        slot = self._slots.pop(response, None)
+        if slot is not None:
+            await slot.aclose()
+
+    @asynccontextmanager
+    async def _request(
+        self, method: str, path: str, *args: Any, idempotent: bool = False, **kwargs: Any
+    ) -> AsyncIterator[ClientResponse]:
+        """
+        Sends request to path formatted with args, kwargs are passed to ClientSession.request.
+        Idempotent requests are retried according to the retry policy.
+        Rate limiter concurrency slot is held until the response is released on exit.
+        """
+        url = self._api_endpoint + path.format(*args)
+        endpoint = f"{method} {path}"
+        policy = self._retry if idempotent else None
+        attempt = 0
+        while True:
+            attempt += 1
+            last = policy is None or attempt >= policy.max_attempts
+            try:
+                if self._hedger is not None and idempotent and method == "GET":
+                    response = await self._send_hedged(self._hedger, method, url, endpoint, **kwargs)
+                else:
+                    response = await self._send(method, url, endpoint, **kwargs)
+            except (ClientConnectionError, asyncio.TimeoutError) as e:
+                if policy is None:
+                    raise
+                if last:
+                    if policy.on_complete is not None:
+                        policy.on_complete(method, url, attempt)
+                    raise
+                event = RetryEvent(method, url, attempt, policy.delay(attempt - 1), error=e)
+            else:
+                if policy is None or last or response.status not in policy.retry_statuses:
+                    break
+                retry_after = response.headers.get("Retry-After")
+                await self._release(response)
+                event = RetryEvent(method, url, attempt, policy.delay(attempt - 1, retry_after), status=response.status)
+            if policy.on_retry is not None:
+                policy.on_retry(event)
+            await asyncio.sleep(event.delay)
+        if policy is not None and policy.on_complete is not None:
+            policy.on_complete(method, url, attempt)
+
+        try:
+            yield response
+        finally:
+            await self._release(response)
+
+    def _cache_ttl(self, value: Any) -> Optional[float]:
+        """
+        Seconds decoded value stays fresh in response cache, None disables caching.
+        """
+        return self._cache.ttl(self._family) if self._cache is not None else None
+
+    def _cache_tags(self, value: Any) -> Iterable[str]:
+        """
+        Ids of entities in decoded value, writes to them invalidate the cached value.
+        """
+        return ()
+
+    def _invalidate(self, entity_id: Any) -> None:
+        if self._cache is not None:
+            self._cache.invalidate(str(entity_id))
+
+    async def _fetch(
+        self,
+        op: str,
+        adapter: TypeAdapter[T],
+        path: str,
+        *args: Any,
+        params: Optional[Mapping[str, Any]] = None,
+        cached: bool = False,
+    ) -> T:
+        """
+        GETs path formatted with args and decodes json body.
+        """
+        return cast(T, await self._load(op, adapter, path, args, params, missing_ok=False, cached=cached))
+
+    async def _find(self, op: str, adapter: TypeAdapter[T], path: str, *args: Any, cached: bool = False) -> Optional[T]:
+        """
+        Same as _fetch, but returns None if entity isn't found.
+        """
+        return await self._load(op, adapter, path, args, None, missing_ok=True, cached=cached)
+
+    async def _load(
+        self,
+        op: str,
+        adapter: TypeAdapter[T],
+        path: str,
+        args: Sequence[Any],
+        params: Optional[Mapping[str, Any]],
+        missing_ok: bool,
+        cached: bool,
+    ) -> Optional[T]:
+        """
+        Concurrent identical calls share one request and one decoded result.
+        Cached values are served while fresh and revalidated with conditional requests when stale.
+        """
+        key = (path.format(*args), tuple(sorted(params.items())) if params else ())
+        cache = self._cache if cached else None
+        entry = cache.get(key) if cache is not None else None
+        if entry is not None and entry.fresh:
+            return entry.value
+
+        async def fetch() -> Optional[T]:
+            kwargs: Dict[str, Any] = {"params": params}
+            if entry is not None and entry.validators():
+                kwargs["headers"] = entry.validators()
+            async with self._request("GET", path, *args, idempotent=True, **kwargs) as response:
+                if cache is not None and entry is not None and response.status == 304:
+                    ttl = self._cache_ttl(entry.value)
+                    if ttl is not None:
+                        cache.touch(key, ttl)
+                    return entry.value
+                if missing_ok and response.status == 404:
+                    if cache is not None:
+                        cache.pop(key)
+                    return None
+                await self._validate_resp(response, [200], op)
+                raw = await response.read()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+            value = self._decode(adapter, raw)
+            if cache is not None:
+                ttl = self._cache_ttl(value)
+                if ttl is not None:
+                    cache.put(key, value, ttl, etag, last_modified, self._cache_tags(value))
+            return value
+
+        if self._flight is None:
+            return await fetch()
+        return await self._flight.do(key, fetch)
+
+    async def _fetch_page(self, op: str, path: str, *args: Any, page: int, limit: int) -> PagedResponse[Dict[str, Any]]:
+        """
+        GETs a page keeping items as parsed json, for exports which don't need models.
+        """
+        params = {"page": page, "limit": limit}
+        async with self._request("GET", path, *args, idempotent=True, params=params) as response:
+            await self._validate_resp(response, [200], op)
+            data = await self._read_json(response)
+        return PagedResponse.model_construct(data=data["data"], has_next=data["has_next"])
+
+    def _decode(self, adapter: TypeAdapter[T], raw: bytes) -> T:
+        """
+        Decodes response body with precompiled adapter, in trusted mode models are constructed without validation.
+        """
+        if self._trusted:
+            return construct(adapter, self._json.loads(raw))
+        return self._json.validate(adapter, raw)
+
+    async def _read_json(self, response: ClientResponse) -> Any:
+        return self._json.loads(await response.read())
 
     @classmethod
     async def _validate_resp(cls, response: ClientResponse, statuses: Iterable[int], method: str) -> None:
@@ -0,0 +1,81 @@
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, FrozenSet, Optional
+
+__all__ = ["RetryPolicy", "RetryEvent", "DEFAULT_RETRY_POLICY"]
+
+
+@dataclass(frozen=True)
+class RetryEvent:
+    """
+    Passed to RetryPolicy.on_retry before every retry.
+    attempt is the number of the failed attempt starting from 1,
+    exactly one of status and error is set.
+    """
+
+    method: str
+    url: str
+    attempt: int
+    delay: float
+    status: Optional[int] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry policy for idempotent requests (GET, delete, proceed), non-idempotent ones are never retried.
+
+    :param max_attempts: total number of attempts including the first one
+    :param base_delay: backoff base in seconds, attempt n waits random(0, base_delay * 2**n)
+    :param max_delay: upper bound of a single delay, Retry-After included
+    :param retry_statuses: response statuses considered transient
+    :param respect_retry_after: use Retry-After header of a response instead of backoff
+    :param on_retry: callback invoked before each retry
+    :param on_complete: callback invoked once per request with method, url and the number of attempts it took,
+        whether the last attempt succeeded or not
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 10.0
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    respect_retry_after: bool = True
+    on_retry: Optional[Callable[[RetryEvent], None]] = None
+    on_complete: Optional[Callable[[str, str, int], None]] = None
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full jitter backoff for zero based attempt number.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2**attempt)))
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if self.respect_retry_after and retry_after:
+            parsed = parse_retry_after(retry_after)
+            if parsed is not None:
+                return min(self.max_delay, parsed)
+        return self.backoff(attempt)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """
+    Parses Retry-After header, it's either delay in seconds or HTTP date.
+    """
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
@@ -1,52 +1,155 @@
 import asyncio
-from copy import deepcopy
-from functools import wraps
+import inspect
+import threading
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Iterable, List, Tuple, Union
 
+from .bulk import BulkResult, collect_bulk
 from .dataspike import Api
 from .resource import Resource
 
 __all__ = ["SyncApi"]
 
+# (method, *args), functools.partial(method, *args, **kwargs) or an awaitable
+Call = Union[Tuple[Any, ...], "partial[Any]", Awaitable[Any]]
+
+
+def _blocking(fn: Callable[..., Any], run: Callable[[Any], Any]) -> Callable[..., Any]:
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        return run(fn(*args, **kwargs))
+
+    # SyncApi.map and gather call the coroutine method itself
+    wrapper.async_method = fn  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _async_method(method: Callable[..., Any]) -> Callable[..., Any]:
+    return getattr(method, "async_method", method)
+
+
+async def _start(call: Call) -> Any:
+    if inspect.isawaitable(call):
+        return await call
+    if isinstance(call, partial):
+        return await _async_method(call.func)(*call.args, **call.keywords)
+    if isinstance(call, tuple) and call:
+        method, *args = call
+        return await _async_method(method)(*args)
+    raise TypeError(f"expected (method, *args), functools.partial or awaitable, got {call!r}")
+
+
+def _is_async(method: Any) -> bool:
+    # it can be decorated with validate_call
+    return asyncio.iscoroutinefunction(getattr(method, "raw_function", method))
+
+
+class _SyncResource:
+    """
+    Blocking view of a resource. Wrappers of its coroutine methods are created on first access
+    and cached in the instance, later lookups don't reach __getattr__.
+    """
+
+    def __init__(self, resource: Resource, run: Callable[[Any], Any]):
+        self._resource = resource
+        self._run = run
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        method = getattr(self._resource, name)
+        if not _is_async(method):
+            raise AttributeError(f"{type(self._resource).__name__}.{name} has no blocking version")
+        wrapper = _blocking(method, self._run)
+        setattr(self, name, wrapper)
+        return wrapper
+
+    def __dir__(self) -> List[str]:
+        resource = self._resource
+        return [n for n in dir(resource) if not n.startswith("_") and _is_async(getattr(resource, n))]
+
+    def __repr__(self) -> str:
+        return f"Sync{type(self._resource).__name__}"
+
 
 class SyncApi:
-    __slots__ = ["applicant", "verification", "document", "aml", "sdk", "__loop", "__api"]
+    """
+    Blocking wrapper of Api, accepts the same arguments.
+    By default calls run on the event loop of the calling thread, so a SyncApi may be used by one thread only.
+    With background_loop=True it owns an event loop running in a daemon thread and submits calls to it,
+    one SyncApi and its connection pool can then be shared by any number of threads and their calls run concurrently.
+    """
+
+    __slots__ = ["applicant", "verification", "document", "aml", "sdk", "__loop", "__api", "__thread", "__closed"]
 
     @staticmethod
     async def __init_api(*args, **kwargs):
         return Api(*args, **kwargs)
 
     def __run(self, fn):
-        return self.__loop.run_until_complete(fn)
+        if self.__thread is None:
+            return self.__loop.run_until_complete(fn)
+        if self.__closed:
+            fn.close()
+            raise RuntimeError("SyncApi is closed")
+        if threading.current_thread() is self.__thread:
+            fn.close()
+            raise RuntimeError("SyncApi can't be called from its own event loop, use Api there")
+        return asyncio.run_coroutine_threadsafe(fn, self.__loop).result()
 
-    def __call(self, fn):
-        @wraps(fn)
-        def wrapper(*args, **kwargs):
-            return self.__run(fn(*args, **kwargs))
+    def __init__(self, *args, background_loop: bool = False, **kwargs):
+        self.__closed = False
+        self.__thread = None
+        if background_loop:
+            self.__loop = asyncio.new_event_loop()
+            self.__thread = threading.Thread(target=self.__loop.run_forever, name="dataspike-sync-loop", daemon=True)
+            self.__thread.start()
+        else:
+            self.__loop = asyncio.get_event_loop()
+        try:
+            self.__api = self.__run(self.__init_api(*args, **kwargs))
+        except BaseException:
+            self.__stop_loop()
+            raise
 
-        return wrapper
+    def __getattr__(self, name: str) -> Any:
+        # resources are wrapped on first access, only unset slots get here
+        if name.startswith("_"):
+            raise AttributeError(name)
+        resource = getattr(self.__api, name, None)
+        if not isinstance(resource, Resource):
+            raise AttributeError(name)
+        holder = _SyncResource(resource, self.__run)
+        setattr(self, name, holder)
+        return holder
 
-    def __init__(self, *args, **kwargs):
-        self.__loop = asyncio.get_event_loop()
-        self.__api = self.__run(self.__init_api(*args, **kwargs))
-        for attr in dir(self.__api):
-            r = getattr(self.__api, attr)
-            if not isinstance(r, Resource):
-                continue
-            holder = type(attr, (object,), {})()
-            for n in dir(r):
-                if n.startswith("_"):
-                    continue
-                m = getattr(r, n)
-                c = m
-                # it can be decorated with validated_arguments
-                if hasattr(m, "raw_function"):
-                    c = m.raw_function
-                if not asyncio.iscoroutinefunction(c):
-                    continue
-                f = deepcopy(self.__call(m))
-                setattr(holder, n, f)
-
-            setattr(self, attr, holder)
+    def map(
+        self, method: Callable[..., Any], items: Iterable[Any], concurrency: int = 10
+    ) -> List[BulkResult[Any, Any]]:
+        """
+        Calls method for every item with at most concurrency calls in flight on the SyncApi loop.
+        Returns a result with value or error per item in input order, errors don't stop other calls.
+
+            results = api.map(api.aml.search, requests, concurrency=20)
+            responses = [r.unwrap() for r in results]
+
+        :param method: method of SyncApi resource, e.g. api.aml.search, or a coroutine function
+        """
+        fn = _async_method(method)
+        return self.__run(collect_bulk(fn, items, concurrency))
+
+    def gather(self, *calls: Call) -> List[BulkResult[Call, Any]]:
+        """
+        Runs calls concurrently on the SyncApi loop and returns a result with value or error per call in order.
+
+            applicant, verifications = (r.unwrap() for r in api.gather(
+                (api.applicant.get, applicant_id),
+                partial(api.verification.list_for_applicant, applicant_id, limit=100),
+            ))
+
+        :param calls: (method, *args) tuples or functools.partial of SyncApi resource methods
+        """
+        return self.__run(collect_bulk(_start, calls, max(len(calls), 1)))
 
     def __enter__(self):
         return self
@@ -57,5 +160,21 @@ class SyncApi:
     def __repr__(self) -> str:
         return f"DataspikeSyncApi<{self.__api.api_endpoint}>"
 
+    def __stop_loop(self) -> None:
+        if self.__thread is None:
+            return
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()
+
     def close(self) -> None:
-        asyncio.run(self.__api.close())
+        """
+        Closes connections, with background_loop also stops the loop thread. Safe to call more than once.
+        """
+        if self.__closed:
+            return
+        try:
+            self.__run(self.__api.close())
+        finally:
+            self.__closed = True
+            self.__stop_loop()
@@ -0,0 +1,206 @@
+import collections.abc
+import dataclasses
+import enum
+import re
+import sys
+import types
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Literal, Tuple, Type, TypeVar, Union, get_args, get_origin, get_type_hints
+from uuid import UUID, SafeUUID
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic.fields import FieldInfo
+from pydantic_core import PydanticUndefined
+
+__all__ = ["VALIDATION_MODES", "adapter_for", "construct", "trust_methods"]
+
+T = TypeVar("T")
+
+VALIDATION_MODES = ("strict", "trusted")
+
+Builder = Callable[[Any], Any]
+
+# type of every adapter made by adapter_for, pydantic doesn't expose it publicly
+_adapter_types: Dict["TypeAdapter[Any]", Any] = {}
+
+_union_types: Tuple[Any, ...] = (Union,)
+if sys.version_info >= (3, 10):
+    _union_types += (types.UnionType,)
+
+
+_FRACTION = re.compile(r"(?<=:\d\d)\.(\d+)")
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _microseconds(match: "re.Match[str]") -> str:
+    # extra digits are truncated like pydantic does
+    return "." + match.group(1)[:6].ljust(6, "0")
+
+
+def _parse_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        # fromisoformat accepts "Z" suffix and fractions other than 3 or 6 digits since python 3.11 only
+        value = _FRACTION.sub(_microseconds, value[:-1] + "+00:00" if value.endswith("Z") else value, count=1)
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _parse_uuid(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    # UUID() spends most of the time checking the format, which trusted input doesn't need
+    uuid = object.__new__(UUID)
+    object.__setattr__(uuid, "int", int(value.replace("-", ""), 16))
+    object.__setattr__(uuid, "is_safe", SafeUUID.unknown)
+    return uuid
+
+
+def _optional(build: Builder) -> Builder:
+    return lambda value: None if value is None else build(value)
+
+
+def _list(build: Builder) -> Builder:
+    if build is _identity:
+        return _identity
+    return lambda value: [build(item) for item in value]
+
+
+def _enum(cls: Type[enum.Enum], fallback: bool) -> Builder:
+    members = cls._value2member_map_
+
+    def build(value: Any) -> Any:
+        member = members.get(value)
+        if member is not None:
+            return member
+        # union with str keeps unknown values as is, otherwise _missing_ decides
+        return value if fallback else cls(value)
+
+    return build
+
+
+def _field_builder(tp: Any) -> Tuple[Builder, bool]:
+    """
+    Builder of a non-null field value and whether it's applied to each item of a list.
+    """
+    if get_origin(tp) in _union_types and type(None) in get_args(tp):
+        args = [arg for arg in get_args(tp) if arg is not type(None)]
+        if len(args) == 1:
+            tp = args[0]
+    if get_origin(tp) in (list, collections.abc.Sequence) and get_args(tp):
+        return _builder(get_args(tp)[0]), True
+    return _builder(tp), False
+
+
+def _dataclass(cls: type) -> Builder:
+    hints = get_type_hints(cls)
+    fields = dataclasses.fields(cls)
+    names = frozenset(f.name for f in fields)
+    converted = [(f.name, *_field_builder(hints[f.name])) for f in fields]
+    constants: Dict[str, Any] = {}
+    factories: List[Tuple[str, Callable[[], Any]]] = []
+    for f in fields:
+        default = f.default
+        factory = f.default_factory
+        if isinstance(default, FieldInfo):
+            default, factory = default.default, default.default_factory or dataclasses.MISSING
+        if factory is not dataclasses.MISSING:
+            factories.append((f.name, factory))
+        elif default is not dataclasses.MISSING and default is not PydanticUndefined:
+            constants[f.name] = default
+    convert = [(name, build, many) for name, build, many in converted if build is not _identity]
+    count = len(names)
+    new = object.__new__
+
+    def build(value: Any) -> Any:
+        obj = new(cls)
+        attrs = obj.__dict__
+        if constants:
+            attrs.update(constants)
+        attrs.update(value)
+        for name, build_field, many in convert:
+            v = attrs.get(name)
+            if v is not None:
+                attrs[name] = [build_field(item) for item in v] if many else build_field(v)
+        for name, factory in factories:
+            if name not in attrs:
+                attrs[name] = factory()
+        if len(attrs) != count:
+            for name in attrs.keys() - names:
+                del attrs[name]
+        return obj
+
+    return build
+
+
+def _model(cls: Type[BaseModel]) -> Builder:
+    hints = {name: _builder(field.annotation) for name, field in cls.model_fields.items()}
+
+    def build(value: Any) -> Any:
+        return cls.model_construct(**{name: hints[name](v) if name in hints else v for name, v in value.items()})
+
+    return build
+
+
+@lru_cache(maxsize=None)
+def _builder(tp: Any) -> Builder:
+    origin = get_origin(tp)
+    if origin in _union_types:
+        args = [arg for arg in get_args(tp) if arg is not type(None)]
+        if len(args) == 2 and args[1] is str and isinstance(args[0], type) and issubclass(args[0], enum.Enum):
+            build = _enum(args[0], fallback=True)
+        elif len(args) == 1:
+            build = _builder(args[0])
+        else:
+            build = _identity
+        return _optional(build) if len(args) < len(get_args(tp)) else build
+    if origin in (list, collections.abc.Sequence):
+        args = get_args(tp)
+        return _list(_builder(args[0]) if args else _identity)
+    if origin is Literal:
+        return _identity
+    if isinstance(tp, type):
+        if dataclasses.is_dataclass(tp):
+            return _dataclass(tp)
+        if issubclass(tp, BaseModel):
+            return _model(tp)
+        if issubclass(tp, enum.Enum):
+            return _enum(tp, fallback=False)
+        if issubclass(tp, UUID):
+            return _parse_uuid
+        if issubclass(tp, datetime):
+            return _parse_datetime
+    return _identity
+
+
+def adapter_for(tp: Type[T]) -> TypeAdapter[T]:
+    """
+    TypeAdapter of tp which construct accepts, meant for module level adapters.
+    """
+    adapter = TypeAdapter(tp)
+    _adapter_types[adapter] = tp
+    return adapter
+
+
+def construct(adapter: TypeAdapter[T], data: Any) -> T:
+    """
+    Builds value of adapter type from parsed json without validation, like BaseModel.model_construct.
+    Only conversions json can't express are made: nested models, enums, UUIDs and datetimes.
+    """
+    tp = _adapter_types.get(adapter)
+    if tp is None:
+        raise ValueError("construct accepts only adapters made by adapter_for")
+    return _builder(tp)(data)
+
+
+def trust_methods(obj: Any) -> None:
+    """
+    Rebinds methods of obj decorated with validate_call to their undecorated versions.
+    """
+    for name in dir(type(obj)):
+        raw = getattr(getattr(type(obj), name, None), "raw_function", None)
+        if raw is not None:
+            setattr(obj, name, types.MethodType(raw, obj))
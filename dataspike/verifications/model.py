@@ -137,10 +137,11 @@ class Verification:
     applicant_id: UUID
     status: VerificationStatus
     organization_id: str
-    account_id: str
-    account_email: str
+    # null in webhook payloads of verifications started without an account, e.g. by link
+    account_id: Optional[str]
+    account_email: Optional[str]
     created_at: datetime
-    is_sandbox: bool
+    is_sandbox: bool = Field(default=False)
     checks: Optional[Checks] = Field(default=None)
     document_type: Optional[DocumentType] = Field(default=None)
     completed_at: Optional[datetime] = Field(default=None)
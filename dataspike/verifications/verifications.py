@@ -1,75 +1,181 @@
-from typing import Any, Optional
+import asyncio
+import os
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Iterable, Optional, Union
 from uuid import UUID
 
-from aiohttp.client import _RequestContextManager
+from aiohttp import ClientResponse
 from pydantic import validate_call
 
 from .model import Verification
+from .watch import TERMINAL_STATUSES, VerificationChange, WatchPolicy, watch_verifications
 from ..resource import Resource
 from ..common import PagedResponse
+from ..export import ExportStats, open_sink, write_pages
+from ..pagination import AdaptiveLimit, iter_items, iter_pages
+from ..trusted import adapter_for
+
+_verification = adapter_for(Verification)
+_verification_page = adapter_for(PagedResponse[Verification])
 
 
 class Verifications(Resource):
-    def _proceed(self, verification_id: UUID) -> _RequestContextManager:
-        return self._session.post(url=f"{self._api_endpoint}/api/v3/verifications/{verification_id}/proceed")
+    _family = "verifications"
+
+    def _proceed(self, verification_id: UUID) -> AsyncContextManager[ClientResponse]:
+        return self._request("POST", "/api/v3/verifications/{}/proceed", verification_id, idempotent=True)
 
     @validate_call
     async def proceed(self, verification_id: UUID) -> None:
         async with self._proceed(verification_id) as response:
             await self._validate_resp(response, [200], "proceed verification")
+        self._invalidate(verification_id)
 
-    def _create(self, applicant_id: Optional[UUID] = None, profile_id: Optional[UUID] = None) -> _RequestContextManager:
+    def _create(
+        self, applicant_id: Optional[UUID] = None, profile_id: Optional[UUID] = None
+    ) -> AsyncContextManager[ClientResponse]:
         body: dict[str, Any] = {}
         if applicant_id is not None:
             body["applicant_id"] = str(applicant_id)
         if profile_id is not None:
             body["profile_id"] = str(profile_id)
 
-        return self._session.post(url=f"{self._api_endpoint}/api/v3/verifications", json=body)
+        return self._request("POST", "/api/v3/verifications", json=body)
 
     @validate_call
     async def create(self, applicant_id: Optional[UUID] = None, profile_id: Optional[UUID] = None) -> Verification:
         async with self._create(applicant_id=applicant_id, profile_id=profile_id) as response:
             await self._validate_resp(response, [201], "create verification")
-            data = await response.json()
+            raw = await response.read()
+        return self._decode(_verification, raw)
 
-        return Verification(**data)
+    def _cache_ttl(self, value: Verification) -> Optional[float]:
+        if self._cache is not None and value.status in TERMINAL_STATUSES:
+            return self._cache.config.terminal_verification_ttl
+        return super()._cache_ttl(value)
 
-    def _get(self, verification_id: UUID) -> _RequestContextManager:
-        return self._session.get(url=f"{self._api_endpoint}/api/v3/verifications/{verification_id}")
+    def _cache_tags(self, value: Verification) -> Iterable[str]:
+        return str(value.id), str(value.applicant_id)
 
     @validate_call
     async def get(self, verification_id: UUID) -> Optional[Verification]:
-        async with self._get(verification_id) as response:
-            await self._validate_resp(response, [200, 404], "find verification")
-            if response.status == 404:
-                return None
-            data = await response.json()
-        return Verification(**data)
-
-    def _list(self, page: int = 0, limit: int = 10) -> _RequestContextManager:
-        return self._session.get(
-            url=f"{self._api_endpoint}/api/v3/verifications", params={"page": page, "limit": limit}
+        return await self._find(
+            "find verification", _verification, "/api/v3/verifications/{}", verification_id, cached=True
         )
 
     @validate_call
     async def list(self, page: int = 0, limit: int = 10) -> PagedResponse[Verification]:
-        async with self._list(page, limit) as response:
-            await self._validate_resp(response, [200], "list verifications")
-            data = await response.json()
-        return PagedResponse[Verification](**data)
-
-    def _list_for_applicant(self, applicant_id: UUID, page: int = 0, limit: int = 10) -> _RequestContextManager:
-        return self._session.get(
-            url=f"{self._api_endpoint}/api/v3/verifications/applicant/{applicant_id}",
-            params={"page": page, "limit": limit},
+        return await self._fetch(
+            "list verifications", _verification_page, "/api/v3/verifications", params={"page": page, "limit": limit}
         )
 
     @validate_call
     async def list_for_applicant(
         self, applicant_id: UUID, page: int = 0, limit: int = 10
     ) -> PagedResponse[Verification]:
-        async with self._list_for_applicant(applicant_id, page, limit) as response:
-            await self._validate_resp(response, [200], "list verifications for applicant")
-            data = await response.json()
-        return PagedResponse[Verification](**data)
+        return await self._fetch(
+            "list verifications for applicant",
+            _verification_page,
+            "/api/v3/verifications/applicant/{}",
+            applicant_id,
+            params={"page": page, "limit": limit},
+        )
+
+    def watch(self, ids: Iterable[UUID], policy: Optional[WatchPolicy] = None) -> AsyncIterator[VerificationChange]:
+        """
+        Polls verifications until all of them are verified or failed and yields changes of their status
+        or check results. Polls without changes back off per verification, many due verifications
+        are refreshed by reading list pages instead of one GET each, see WatchPolicy.
+        Verifications already completed when first seen are yielded once, missing ones are dropped.
+        Transient errors (connection errors, timeouts, 429 and 5xx responses) are retried on the next poll,
+        other errors are raised.
+
+            async for change in api.verification.watch(ids):
+                print(change.verification.id, change.verification.status, change.changed_checks)
+        """
+        return watch_verifications(self._get_fresh, lambda page, limit: self.list(page=page, limit=limit), ids, policy)
+
+    async def wait_for(
+        self, verification_id: UUID, timeout: Optional[float] = None, policy: Optional[WatchPolicy] = None
+    ) -> Optional[Verification]:
+        """
+        Waits until verification is verified or failed and returns it, None if it doesn't exist.
+        :param timeout: seconds to wait, asyncio.TimeoutError is raised when it's exceeded
+        """
+
+        async def wait() -> Optional[Verification]:
+            async for change in self.watch([verification_id], policy):
+                if change.completed:
+                    return change.verification
+            return None
+
+        return await asyncio.wait_for(wait(), timeout)
+
+    async def _get_fresh(self, verification_id: UUID) -> Optional[Verification]:
+        # watching needs current state, response cache is bypassed
+        return await self._find(
+            "find verification", _verification, "/api/v3/verifications/{}", verification_id, cached=False
+        )
+
+    def iter_pages(
+        self, limit: int = 10, prefetch: int = 1, adaptive: Optional[AdaptiveLimit] = None
+    ) -> AsyncIterator[PagedResponse[Verification]]:
+        """
+        Iterates over all verifications page by page, up to prefetch next pages are requested in background.
+        :param adaptive: adjust limit by observed page latency
+        """
+        return iter_pages(
+            lambda page, limit: self.list(page=page, limit=limit), limit=limit, prefetch=prefetch, adaptive=adaptive
+        )
+
+    def iter_all(
+        self, limit: int = 10, prefetch: int = 1, adaptive: Optional[AdaptiveLimit] = None
+    ) -> AsyncIterator[Verification]:
+        """
+        Same as iter_pages, but yields verifications one by one.
+        """
+        return iter_items(self.iter_pages(limit=limit, prefetch=prefetch, adaptive=adaptive))
+
+    def iter_pages_for_applicant(
+        self, applicant_id: UUID, limit: int = 10, prefetch: int = 1, adaptive: Optional[AdaptiveLimit] = None
+    ) -> AsyncIterator[PagedResponse[Verification]]:
+        """
+        Iterates over verifications of applicant page by page, see iter_pages.
+        """
+        return iter_pages(
+            lambda page, limit: self.list_for_applicant(applicant_id, page=page, limit=limit),
+            limit=limit,
+            prefetch=prefetch,
+            adaptive=adaptive,
+        )
+
+    def iter_all_for_applicant(
+        self, applicant_id: UUID, limit: int = 10, prefetch: int = 1, adaptive: Optional[AdaptiveLimit] = None
+    ) -> AsyncIterator[Verification]:
+        """
+        Same as iter_pages_for_applicant, but yields verifications one by one.
+        """
+        return iter_items(
+            self.iter_pages_for_applicant(applicant_id, limit=limit, prefetch=prefetch, adaptive=adaptive)
+        )
+
+    async def export(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        format: Optional[str] = None,
+        compression: Optional[str] = "auto",
+        limit: int = 100,
+        prefetch: int = 2,
+        progress: Optional[Callable[[ExportStats], None]] = None,
+    ) -> ExportStats:
+        """
+        Streams all verifications into ndjson, csv or parquet file, pages are written as they arrive
+        without building models. Format and compression are guessed from path, e.g. "verifications.csv.gz".
+        :param progress: called with export stats after every page
+        """
+        sink = open_sink(path, Verification, format, compression, self._json.dumps)
+        pages = iter_pages(
+            lambda page, limit: self._fetch_page("list verifications", "/api/v3/verifications", page=page, limit=limit),
+            limit=limit,
+            prefetch=prefetch,
+        )
+        return await write_pages(pages, sink, progress)
@@ -0,0 +1,245 @@
+import asyncio
+import heapq
+import random
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from aiohttp import ClientConnectionError
+
+from .model import Checks, Verification, VerificationStatus
+from ..bulk import collect_bulk
+from ..common import PagedResponse
+from ..errors import UnexpectedResponseStatus
+
+__all__ = ["WatchPolicy", "VerificationChange", "watch_verifications"]
+
+TERMINAL_STATUSES = frozenset({VerificationStatus.Verified, VerificationStatus.Failed})
+
+Getter = Callable[[UUID], Awaitable[Optional[Verification]]]
+Lister = Callable[[int, int], Awaitable[PagedResponse[Verification]]]
+
+_CHECK_NAMES = ("document_ocr", "face_comparison", "liveness", "document_mrz", "poa")
+
+
+@dataclass(frozen=True)
+class WatchPolicy:
+    """
+    Polling schedule of watched verifications. Every verification has its own interval, it starts
+    at min_interval, grows by backoff factor while nothing changes and resets when it does.
+    Due verifications are refreshed with individual GETs, or by sweeping list pages when
+    the pages which hold them are fewer than the verifications.
+
+    :param min_interval: seconds between polls of a verification which just changed
+    :param max_interval: upper bound of poll interval
+    :param backoff: interval multiplier after a poll without changes
+    :param jitter: random share added to intervals so polls of many verifications spread out
+    :param page_limit: page size of sweeps
+    :param max_sweep_pages: pages a sweep may read, verifications not found in them are fetched one by one
+    :param concurrency: individual GETs in flight
+    """
+
+    min_interval: float = 2.0
+    max_interval: float = 60.0
+    backoff: float = 1.5
+    jitter: float = 0.1
+    page_limit: int = 100
+    max_sweep_pages: int = 10
+    concurrency: int = 10
+
+
+@dataclass(frozen=True)
+class VerificationChange:
+    """
+    Observed change of a watched verification.
+
+    :param verification: current state
+    :param previous: state seen before, None for the first observation
+    :param changed_checks: names of checks whose result differs from the previous state
+    """
+
+    verification: Verification
+    previous: Optional[Verification] = None
+    changed_checks: Tuple[str, ...] = ()
+
+    @property
+    def status_changed(self) -> bool:
+        return self.previous is None or self.previous.status != self.verification.status
+
+    @property
+    def completed(self) -> bool:
+        return self.verification.status in TERMINAL_STATUSES
+
+
+def _is_transient(error: BaseException) -> bool:
+    """
+    Errors after which the poll is repeated later, everything else ends the watch.
+    """
+    if isinstance(error, (ClientConnectionError, asyncio.TimeoutError)):
+        return True
+    return isinstance(error, UnexpectedResponseStatus) and (error.code == 429 or error.code >= 500)
+
+
+def _changed_checks(old: Optional[Checks], new: Optional[Checks]) -> Tuple[str, ...]:
+    if old == new:
+        return ()
+    return tuple(name for name in _CHECK_NAMES if getattr(old, name, None) != getattr(new, name, None))
+
+
+@dataclass
+class _Watched:
+    id: UUID
+    interval: float
+    due: float
+    last: Optional[Verification] = None
+    # page the verification was last seen on by a sweep
+    page: Optional[int] = None
+    done: bool = False
+
+
+class _Watcher:
+    def __init__(self, get: Getter, list_page: Lister, policy: WatchPolicy):
+        self._get = get
+        self._list = list_page
+        self._policy = policy
+        self._items: Dict[UUID, _Watched] = {}
+        self._queue: List[Tuple[float, int, UUID]] = []
+        self._seq = 0
+
+    def add(self, ids: Iterable[UUID], now: float) -> None:
+        for id in ids:
+            if id not in self._items:
+                self._items[id] = _Watched(id, self._policy.min_interval, now)
+                self._schedule(self._items[id])
+
+    def _schedule(self, item: _Watched) -> None:
+        self._seq += 1
+        heapq.heappush(self._queue, (item.due, self._seq, item.id))
+
+    def _delay(self, interval: float) -> float:
+        return interval * (1 + random.uniform(0, self._policy.jitter))
+
+    def _due(self, now: float) -> List[_Watched]:
+        due: Dict[UUID, _Watched] = {}
+        while self._queue and self._queue[0][0] <= now:
+            _, _, id = heapq.heappop(self._queue)
+            item = self._items.get(id)
+            # heap may hold entries of rescheduled or finished items
+            if item is not None and item.due <= now:
+                due[id] = item
+        return list(due.values())
+
+    def _observe(
+        self, item: _Watched, verification: Optional[Verification], now: float
+    ) -> Optional[VerificationChange]:
+        policy = self._policy
+        change = None
+        if verification is None:
+            # verification doesn't exist, nothing to wait for
+            item.done = True
+        elif item.last is None:
+            if verification.status in TERMINAL_STATUSES:
+                change = VerificationChange(verification)
+        else:
+            checks = _changed_checks(item.last.checks, verification.checks)
+            if checks or item.last.status != verification.status:
+                change = VerificationChange(verification, item.last, checks)
+        if verification is not None:
+            item.last = verification
+            item.done = verification.status in TERMINAL_STATUSES
+        if item.done:
+            del self._items[item.id]
+            return change
+        if change is not None:
+            item.interval = policy.min_interval
+        else:
+            item.interval = min(item.interval * policy.backoff, policy.max_interval)
+        item.due = now + self._delay(item.interval)
+        self._schedule(item)
+        return change
+
+    def _retry_later(self, item: _Watched, now: float) -> None:
+        item.interval = min(item.interval * self._policy.backoff, self._policy.max_interval)
+        item.due = now + self._delay(item.interval)
+        self._schedule(item)
+
+    def _sweep_pages(self, due: List[_Watched]) -> int:
+        """
+        Estimated pages a sweep has to read to find all due verifications.
+        """
+        pages = [item.page for item in due]
+        if any(page is None for page in pages):
+            return self._policy.max_sweep_pages
+        return min(max(pages) + 2, self._policy.max_sweep_pages)  # type: ignore[type-var]
+
+    async def _sweep(self, wanted: Dict[UUID, _Watched], changes: List[VerificationChange], now: float) -> None:
+        """
+        Reads list pages until all wanted verifications are found, found ones are removed from wanted.
+        Not yet due verifications found on the way are refreshed as well.
+        """
+        for page in range(self._policy.max_sweep_pages):
+            response = await self._list(page, self._policy.page_limit)
+            for verification in response.data:
+                item = wanted.pop(verification.id, None) or self._items.get(verification.id)
+                if item is None:
+                    continue
+                item.page = page
+                change = self._observe(item, verification, now)
+                if change is not None:
+                    changes.append(change)
+            if not wanted or not response.has_next:
+                return
+
+    async def _fetch(self, due: List[_Watched], now: float) -> List[VerificationChange]:
+        results = await collect_bulk(lambda item: self._get(item.id), due, self._policy.concurrency)
+        changes = []
+        for result in results:
+            if result.error is not None:
+                if not _is_transient(result.error):
+                    raise result.error
+                self._retry_later(result.item, now)
+                continue
+            change = self._observe(result.item, result.value, now)
+            if change is not None:
+                changes.append(change)
+        return changes
+
+    async def poll(self) -> List[VerificationChange]:
+        """
+        Waits until some verifications are due and refreshes them.
+        """
+        loop = asyncio.get_running_loop()
+        if self._queue:
+            await asyncio.sleep(max(0.0, self._queue[0][0] - loop.time()))
+        now = loop.time()
+        due = self._due(now)
+        if not due:
+            return []
+        changes: List[VerificationChange] = []
+        if len(due) > 1 and self._sweep_pages(due) < len(due):
+            wanted = {item.id: item for item in due}
+            try:
+                await self._sweep(wanted, changes, now)
+            except Exception as e:
+                # sweep is an optimization, after a transient failure the rest is fetched with individual requests
+                if not _is_transient(e):
+                    raise
+            due = list(wanted.values())
+        changes.extend(await self._fetch(due, now))
+        return changes
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+
+async def watch_verifications(
+    get: Getter, list_page: Lister, ids: Iterable[UUID], policy: Optional[WatchPolicy] = None
+) -> AsyncIterator[VerificationChange]:
+    """
+    Yields changes of status or checks of verifications until all of them complete.
+    """
+    watcher = _Watcher(get, list_page, policy or WatchPolicy())
+    watcher.add(ids, asyncio.get_running_loop().time())
+    while watcher:
+        for change in await watcher.poll():
+            yield change
@@ -0,0 +1,2 @@
+from .model import *
+from .receiver import WebhookReceiver, InvalidSignature
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Any, Optional, Union
+from uuid import UUID
+
+from pydantic.dataclasses import dataclass
+from pydantic.fields import Field
+
+from ..aml.model import AMLResponse
+from ..utils import StrEnum
+
+__all__ = ["EventType", "AMLScreening", "WebhookEvent"]
+
+
+class EventType(StrEnum):
+    Docver = "DOCVER"
+    AmlScreening = "AML_SCREENING"
+
+
+@dataclass
+class AMLScreening:
+    screening_id: UUID
+    search_result: AMLResponse
+    applicant_id: Optional[UUID] = Field(default=None)
+    search_request: Optional[dict] = Field(default=None)  # json
+    risk_score: Optional[dict] = Field(default=None)  # json, e.g. {"type": "Low"}
+    completed_at: Optional[datetime] = Field(default=None)
+
+
+@dataclass
+class WebhookEvent:
+    """
+    Webhook delivery, payload is Verification for DOCVER events, AMLScreening for AML_SCREENING events
+    and parsed json for events of other types.
+    """
+
+    id: UUID
+    webhook_id: UUID
+    timestamp: datetime
+    payload: Any
+    event_type: Union[EventType, str] = Field(union_mode="left_to_right")
@@ -0,0 +1,155 @@
+import asyncio
+import hmac
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+from aiohttp import web
+from pydantic import TypeAdapter
+
+from .model import AMLScreening, EventType, WebhookEvent
+from ..errors import DataspikeError
+from ..json_backend import JsonBackend, get_json_backend
+from ..trusted import VALIDATION_MODES, adapter_for, construct
+from ..verifications.model import Verification
+
+__all__ = ["WebhookReceiver", "InvalidSignature"]
+
+DEFAULT_SIGNATURE_HEADER = "X-Dataspike-Signature"
+
+_event = adapter_for(WebhookEvent)
+_payloads: Dict[str, TypeAdapter[Any]] = {
+    EventType.Docver: adapter_for(Verification),
+    EventType.AmlScreening: adapter_for(AMLScreening),
+}
+
+
+class InvalidSignature(DataspikeError):
+    pass
+
+
+class WebhookReceiver:
+    """
+    Receives webhook deliveries over HTTP and queues them as decoded WebhookEvents.
+    The queue is bounded: when it's full the handler waits for a free slot up to put_timeout and
+    then answers 503, so Dataspike redelivers the event later instead of it being lost.
+
+        receiver = WebhookReceiver(secret)
+        receiver.add_routes(app, "/webhooks/dataspike")
+        async for event in receiver:
+            if event.event_type == EventType.Docver:
+                print(event.payload.status)
+
+    :param secret: webhook secret, body signature is HMAC of the raw body with it,
+        None disables the check, e.g. for local testing
+    :param queue_size: events waiting for consumer
+    :param put_timeout: seconds handler waits for queue space before answering 503, None waits forever
+    :param signature_header: request header carrying hex signature, optionally prefixed with "sha256="
+    :param digest: hash function of HMAC
+    :param validation: "strict" validates payloads, "trusted" builds models without validation like Api does
+    :param json: json backend name or instance, see Api
+    """
+
+    def __init__(
+        self,
+        secret: Optional[Union[str, bytes]],
+        queue_size: int = 1000,
+        put_timeout: Optional[float] = 5.0,
+        signature_header: str = DEFAULT_SIGNATURE_HEADER,
+        digest: str = "sha256",
+        validation: str = "strict",
+        json: Union[str, JsonBackend] = "auto",
+    ):
+        if validation not in VALIDATION_MODES:
+            raise ValueError(f"validation should be one of {', '.join(VALIDATION_MODES)}, got {validation}")
+        self._secret = secret.encode() if isinstance(secret, str) else secret
+        self._queue_size = queue_size
+        self._queue: Optional["asyncio.Queue[WebhookEvent]"] = None
+        self._put_timeout = put_timeout
+        self._signature_header = signature_header
+        self._digest = digest
+        self._trusted = validation == "trusted"
+        self._json = get_json_backend(json)
+
+    @property
+    def queue(self) -> "asyncio.Queue[WebhookEvent]":
+        # created on first use so it belongs to the running loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(self._queue_size)
+        return self._queue
+
+    def sign(self, body: bytes) -> str:
+        """
+        Signature of body, handy for sending test deliveries.
+        """
+        if self._secret is None:
+            raise ValueError("receiver has no secret")
+        return hmac.new(self._secret, body, self._digest).hexdigest()
+
+    def verify(self, body: bytes, signature: Optional[str]) -> None:
+        """
+        Raises InvalidSignature unless signature matches body.
+        """
+        if self._secret is None:
+            return
+        if not signature:
+            raise InvalidSignature("webhook signature is missing")
+        _, _, signature = signature.rpartition("=")
+        if not hmac.compare_digest(self.sign(body), signature.strip().lower()):
+            raise InvalidSignature("webhook signature doesn't match")
+
+    def decode(self, body: Union[str, bytes]) -> WebhookEvent:
+        """
+        Decodes delivery body, payloads of known event types become models.
+        """
+        data = self._json.loads(body)
+        if not isinstance(data, dict):
+            raise ValueError(f"webhook body must be a json object, got {type(data).__name__}")
+        adapter = _payloads.get(data.get("event_type", ""))
+        if adapter is not None:
+            payload = data["payload"]
+            data["payload"] = construct(adapter, payload) if self._trusted else adapter.validate_python(payload)
+        return construct(_event, data) if self._trusted else _event.validate_python(data)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """
+        aiohttp handler of webhook deliveries.
+        """
+        body = await request.read()
+        try:
+            self.verify(body, request.headers.get(self._signature_header))
+        except InvalidSignature as e:
+            return web.Response(status=401, text=str(e))
+        try:
+            event = self.decode(body)
+        except (ValueError, KeyError, TypeError) as e:
+            # pydantic ValidationError is a ValueError
+            return web.Response(status=400, text=f"can't decode webhook: {e}")
+        try:
+            await asyncio.wait_for(self.queue.put(event), self._put_timeout)
+        except asyncio.TimeoutError:
+            return web.Response(status=503, text="webhook queue is full", headers={"Retry-After": "5"})
+        return web.Response(status=200)
+
+    def add_routes(self, app: web.Application, path: str = "/webhooks/dataspike") -> None:
+        """
+        Mounts handler into existing application.
+        """
+        app.router.add_post(path, self.handle)
+
+    def app(self, path: str = "/webhooks/dataspike") -> web.Application:
+        """
+        Standalone application, run it with aiohttp.web.run_app or AppRunner.
+        """
+        app = web.Application()
+        self.add_routes(app, path)
+        return app
+
+    async def get(self) -> WebhookEvent:
+        return await self.queue.get()
+
+    async def __aiter__(self) -> AsyncIterator[WebhookEvent]:
+        while True:
+            event = await self.queue.get()
+            try:
+                yield event
+            finally:
+                self.queue.task_done()
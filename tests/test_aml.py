@@ -1,5 +1,7 @@
 from uuid import UUID
-from dataspike import Api, AMLEntity, AMLResponse, AMLSearchRequest, SourceData, DataSource
+from aioresponses import CallbackResult
+
+from dataspike import Api, AMLEntity, AMLResponse, AMLSearchRequest, SourceData, DataSource, RiskScore
 from conftest import to_json
 
 from polyfactory.factories import DataclassFactory
@@ -66,3 +68,54 @@ async def test_aml_known_data_source(aioresponses, api: Api):
     assert got.fields.sources and len(got.fields.sources) == 1
     print(type(got.fields.sources[0].source_id))
     assert isinstance(got.fields.sources[0].source_id, DataSource)
+
+
+async def test_aml_search_many_dedupes_equivalent_requests(aioresponses, api: Api):
+    responses = {}
+
+    def search(url, json, **kwargs):
+        name = json.full_name
+        if name == "Broken":
+            return CallbackResult(status=500, body="error")
+        response = responses[name, len(json.risk_scores)] = AMLResponseFactory.build(requested_name=name)
+        return CallbackResult(status=200, body=to_json(response))
+
+    aioresponses.post("https://api.dataspike.io/api/v3/aml/search", callback=search, repeat=True)
+    requests = [
+        AMLSearchRequest(full_name="John Doe", risk_scores=[RiskScore.High, RiskScore.Low], countries=["gb"]),
+        AMLSearchRequest(full_name="Jane Doe", risk_scores=[RiskScore.High]),
+        AMLSearchRequest(full_name=" john  doe", risk_scores=[RiskScore.Low, RiskScore.High], countries=["GB"]),
+        AMLSearchRequest(full_name="Broken", risk_scores=[RiskScore.High]),
+        AMLSearchRequest(full_name="John Doe", risk_scores=[RiskScore.High], countries=["GB"]),
+    ]
+
+    results = [r async for r in api.aml.search_many(requests, concurrency=3)]
+
+    assert [r.item for r in results] == requests
+    assert sum(len(calls) for calls in aioresponses.requests.values()) == 4
+    assert results[0].ok and results[0].value is results[2].value
+    assert results[0].value == responses["John Doe", 2]
+    assert results[1].value == responses["Jane Doe", 1]
+    assert results[3].error is not None
+    assert results[4].value == responses["John Doe", 1]
+
+
+async def test_aml_search_many_streams_async_input(aioresponses, api: Api):
+    names = []
+
+    def search(url, json, **kwargs):
+        names.append(json.full_name)
+        return CallbackResult(status=200, body=to_json(AMLResponseFactory.build(requested_name=json.full_name)))
+
+    aioresponses.post("https://api.dataspike.io/api/v3/aml/search", callback=search, repeat=True)
+
+    async def requests():
+        for name in ("A", "B", "C", "D", "A"):
+            yield AMLSearchRequest(full_name=name, risk_scores=[RiskScore.High])
+
+    results = [r async for r in api.aml.search_many(requests(), concurrency=1)]
+
+    assert [r.item.full_name for r in results] == ["A", "B", "C", "D", "A"]
+    assert all(r.ok for r in results)
+    # the first search of "A" was yielded and forgotten before the repeat was read
+    assert names == ["A", "B", "C", "D", "A"]
@@ -0,0 +1,42 @@
+from conftest import to_json
+from dataspike import Api, EntityTag, LazyAMLEntity
+from test_aml import AMLRequestFactory, AMLResponseFactory
+
+
+async def test_aml_search_lazy(aioresponses, api: Api):
+    response = AMLResponseFactory.build()
+    aioresponses.post("https://api.dataspike.io/api/v3/aml/search", body=to_json(response))
+
+    got = await api.aml.search_lazy(AMLRequestFactory.build())
+    aioresponses.assert_called_once()
+    assert got.requested_name == response.requested_name
+    assert got.search_uuid == response.search_uuid
+    assert len(got.data) == len(response.data)
+    assert got.materialize() == response
+
+    for lazy, entity in zip(got, response.data):
+        assert isinstance(lazy, LazyAMLEntity)
+        assert lazy.uuid == entity.uuid
+        assert lazy.risk_score == entity.risk_score
+        assert lazy.tags == entity.tags
+        assert lazy.fields.names == entity.fields.names
+        assert lazy.fields.sources == entity.fields.sources
+        assert lazy.materialize() == entity
+
+
+def test_lazy_entity_validates_on_access():
+    raw = {
+        "uuid": "00000000-0000-0000-0000-000000000001",
+        "type": "Person",
+        "risk_score": "High",
+        "tags": ["PEP", "NewTag"],
+        "fields": {"names": [{"full_name": "John Doe"}], "addresses": [{"country": 1}]},
+    }
+    entity = LazyAMLEntity(raw)
+    assert repr(entity) == "LazyAMLEntity<validated: nothing>"
+    assert entity.tags == [EntityTag.PEP, "NewTag"]
+    assert entity.tags is entity.tags
+    assert entity.annotation is None
+    assert entity.fields.names[0].full_name == "John Doe"
+    assert entity.fields.media is None
+    assert repr(entity) == "LazyAMLEntity<validated: tags, annotation, fields>"
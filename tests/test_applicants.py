@@ -1,7 +1,11 @@
 from uuid import UUID
 
+from aioresponses import CallbackResult
+
 from conftest import to_json
 from dataspike import Applicant, ApplicantInfo, Api, PagedResponse
+from dataspike.applicants import applicants
+from dataspike.errors import UnexpectedResponseStatus
 
 
 async def test_applicant_get(aioresponses, api: Api):
@@ -74,3 +78,51 @@ async def test_applicant_delete(aioresponses, api: Api):
 
     await api.applicant.delete(applicant_id)
     aioresponses.assert_called_once_with(url, "DELETE")
+
+
+async def test_applicant_create_many(aioresponses, api: Api):
+    existing_id = UUID(int=1)
+    existing = Applicant(applicant_id=existing_id, external_id="exists", system_info=ApplicantInfo())
+    url = "https://api.dataspike.io/api/v3/applicants"
+    for external_id in ("a", "b", "bad"):
+        aioresponses.get(f"{url}/by_external_id/{external_id}", status=404)
+    aioresponses.get(f"{url}/by_external_id/exists", body=to_json(existing))
+
+    def create(url, json, **kwargs):
+        if json["external_id"] == "bad":
+            return CallbackResult(status=400, body="bad request")
+        return CallbackResult(status=201, body=to_json({"id": str(UUID(int=ord(json["external_id"])))}))
+
+    aioresponses.post(url, callback=create, repeat=True)
+
+    info = ApplicantInfo(full_name="John Doe")
+    items = [("a", info), ("exists", info), ("b", None), ("a", info), ("bad", info)]
+    results = [r async for r in api.applicant.create_many(items, concurrency=2)]
+
+    assert [r.item for r in results] == items
+    assert [r.value for r in results[:4]] == [UUID(int=ord("a")), existing_id, UUID(int=ord("b")), UUID(int=ord("a"))]
+    assert [r.skipped for r in results[:4]] == [False, True, False, True]
+    assert isinstance(results[4].error, UnexpectedResponseStatus)
+    assert len([key for key in aioresponses.requests if key[0] == "POST"]) == 1
+    assert sum(len(calls) for key, calls in aioresponses.requests.items() if key[0] == "POST") == 3
+
+
+async def test_applicant_create_many_forgets_old_external_ids(aioresponses, api: Api, monkeypatch):
+    monkeypatch.setattr(applicants, "_RECENT_EXTERNAL_IDS", 2)
+    url = "https://api.dataspike.io/api/v3/applicants"
+    created = []
+
+    def create(url, json, **kwargs):
+        created.append(json["external_id"])
+        return CallbackResult(status=201, body=to_json({"id": str(UUID(int=len(created)))}))
+
+    aioresponses.post(url, callback=create, repeat=True)
+
+    # with concurrency 1 the last 4 external ids are remembered
+    items = [(external_id, None) for external_id in "abcdeae"]
+    results = [r async for r in api.applicant.create_many(items, concurrency=1, skip_existing=False)]
+
+    assert [r.skipped for r in results] == [False] * 6 + [True]
+    assert results[6].value == results[4].value
+    # "a" is forgotten, without the lookup of existing applicants it's created again
+    assert created == list("abcdea")
@@ -0,0 +1,83 @@
+from uuid import UUID
+
+import pytest
+
+from conftest import to_json
+from dataspike import Api, CircuitBreaker, CircuitBreakerConfig, CircuitState
+from dataspike.errors import CircuitOpenError, UnexpectedResponseStatus
+
+config = CircuitBreakerConfig(failure_rate_threshold=0.5, window_size=4, min_calls=4, probe_interval=0)
+
+
+def test_breaker_opens_on_failure_rate():
+    breaker = CircuitBreaker(CircuitBreakerConfig(window_size=4, min_calls=4, probe_interval=60))
+    for success in (True, False, True):
+        token = breaker.before("GET /a")
+        breaker.record("GET /a", success, token)
+    assert breaker.state("GET /a") == CircuitState.Closed
+    token = breaker.before("GET /a")
+    breaker.record("GET /a", False, token)
+    assert breaker.state("GET /a") == CircuitState.Open
+    with pytest.raises(CircuitOpenError) as e:
+        breaker.before("GET /a")
+    assert e.value.endpoint == "GET /a"
+    # other endpoints aren't affected
+    breaker.before("GET /b")
+
+
+def test_breaker_half_open_probe():
+    breaker = CircuitBreaker(config)
+    for _ in range(4):
+        token = breaker.before("GET /a")
+        breaker.record("GET /a", False, token)
+    assert breaker.state("GET /a") == CircuitState.Open
+
+    probe = breaker.before("GET /a")
+    assert breaker.state("GET /a") == CircuitState.HalfOpen
+    with pytest.raises(CircuitOpenError):
+        breaker.before("GET /a")
+    breaker.record("GET /a", False, probe)
+    assert breaker.state("GET /a") == CircuitState.Open
+
+    probe = breaker.before("GET /a")
+    breaker.record("GET /a", True, probe)
+    assert breaker.state("GET /a") == CircuitState.Closed
+
+
+def test_breaker_ignores_calls_started_before_opening():
+    breaker = CircuitBreaker(config)
+    slow = breaker.before("GET /a")
+    for _ in range(4):
+        token = breaker.before("GET /a")
+        breaker.record("GET /a", False, token)
+    assert breaker.state("GET /a") == CircuitState.Open
+
+    probe = breaker.before("GET /a")
+    # call sent while the circuit was closed completes, it isn't the probe
+    breaker.record("GET /a", True, slow)
+    assert breaker.state("GET /a") == CircuitState.HalfOpen
+    with pytest.raises(CircuitOpenError):
+        breaker.before("GET /a")
+    breaker.record("GET /a", False, probe)
+    assert breaker.state("GET /a") == CircuitState.Open
+
+
+async def test_breaker_fails_fast_per_template(aioresponses):
+    search_id = UUID(int=21314351524642462451465345)
+    aioresponses.get(f"https://api.dataspike.io/api/v3/aml/search/{search_id}", status=503, repeat=True)
+    breaker = CircuitBreaker(CircuitBreakerConfig(window_size=2, min_calls=2, probe_interval=60))
+
+    async with Api("token", retry=None, breaker=breaker) as api:
+        for _ in range(2):
+            with pytest.raises(UnexpectedResponseStatus):
+                await api.aml.get(search_id)
+        with pytest.raises(CircuitOpenError):
+            await api.aml.get(UUID(int=1))
+        assert breaker.state("GET /api/v3/aml/search/{}") == CircuitState.Open
+
+        applicant_id = UUID(int=2135551524642452462234234)
+        aioresponses.get(
+            f"https://api.dataspike.io/api/v3/applicants/{applicant_id}",
+            body=to_json({"applicant_id": applicant_id, "system_info": {}}),
+        )
+        assert await api.applicant.get(applicant_id) is not None
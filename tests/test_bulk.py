@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from dataspike.bulk import collect_bulk, run_bulk
+
+
+async def test_run_bulk_ordered_with_errors():
+    running = 0
+    max_running = 0
+
+    async def call(i: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.001 * (i % 3))
+        running -= 1
+        if i == 5:
+            raise ValueError("bad item")
+        return i * 2
+
+    results = await collect_bulk(call, range(20), concurrency=4)
+
+    assert max_running == 4
+    assert [r.index for r in results] == list(range(20))
+    assert [r.value for r in results if r.ok] == [i * 2 for i in range(20) if i != 5]
+    assert isinstance(results[5].error, ValueError)
+    with pytest.raises(ValueError):
+        results[5].unwrap()
+
+
+async def test_run_bulk_completion_order_and_async_input():
+    async def items():
+        for i in (3, 1, 2):
+            yield i
+
+    async def call(i: int) -> int:
+        await asyncio.sleep(0.01 * i)
+        return i
+
+    got = [r.value async for r in run_bulk(call, items(), concurrency=3, ordered=False)]
+    assert got == [1, 2, 3]
+
+
+async def test_run_bulk_pulls_items_lazily():
+    pulled = []
+
+    def items():
+        for i in range(1000):
+            pulled.append(i)
+            yield i
+
+    async def call(i: int) -> int:
+        return i
+
+    results = run_bulk(call, items(), concurrency=5)
+    async for result in results:
+        if result.index == 10:
+            break
+    await results.aclose()
+    assert len(pulled) < 30
@@ -0,0 +1,76 @@
+from uuid import UUID
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from yarl import URL
+
+from conftest import to_json
+from dataspike import Api, CacheConfig, VerificationStatus
+from dataspike.cache import ResponseCache
+
+applicant_id = UUID(int=2135551524642452462234234)
+applicant_url = f"https://api.dataspike.io/api/v3/applicants/{applicant_id}"
+applicant_body = to_json({"applicant_id": applicant_id, "system_info": {"full_name": "John Doe"}})
+
+
+async def test_cached_get(aioresponses):
+    aioresponses.get(applicant_url, body=applicant_body, repeat=True)
+    async with Api("token", cache=CacheConfig()) as api:
+        first = await api.applicant.get(applicant_id)
+        second = await api.applicant.get(applicant_id)
+    assert first is second
+    aioresponses.assert_called_once()
+
+
+async def test_delete_invalidates_cache(aioresponses):
+    aioresponses.get(applicant_url, body=applicant_body, repeat=True)
+    aioresponses.delete(applicant_url)
+    async with Api("token", cache=CacheConfig()) as api:
+        await api.applicant.get(applicant_id)
+        await api.applicant.delete(applicant_id)
+        assert api.cache is not None and len(api.cache) == 0
+        await api.applicant.get(applicant_id)
+    assert len(aioresponses.requests[("GET", URL(applicant_url))]) == 2
+
+
+async def test_terminal_verification_cached_longer(aioresponses, verification):
+    verification.status = VerificationStatus.Verified
+    url = f"https://api.dataspike.io/api/v3/verifications/{verification.id}"
+    aioresponses.get(url, body=to_json(verification), repeat=True)
+    async with Api("token", cache=CacheConfig(ttl={"verifications": 0})) as api:
+        await api.verification.get(verification.id)
+        await api.verification.get(verification.id)
+    aioresponses.assert_called_once()
+
+
+async def test_etag_revalidation():
+    seen = []
+
+    async def handler(request: web.Request) -> web.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=applicant_body, content_type="application/json", headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/api/v3/applicants/{id}", handler)
+    async with TestServer(app) as server:
+        endpoint = str(server.make_url("")).rstrip("/")
+        async with Api("token", endpoint, cache=CacheConfig(ttl={"applicants": 0})) as api:
+            first = await api.applicant.get(applicant_id)
+            second = await api.applicant.get(applicant_id)
+    assert first is second
+    assert seen == [None, '"v1"']
+
+
+def test_lru_eviction():
+    cache = ResponseCache(CacheConfig(max_entries=2))
+    cache.put("a", 1, 60, tags=["x"])
+    cache.put("b", 2, 60)
+    assert cache.get("a") is not None
+    cache.put("c", 3, 60)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    cache.invalidate("x")
+    assert cache.get("a") is None
+    assert len(cache) == 1
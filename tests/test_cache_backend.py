@@ -0,0 +1,86 @@
+from uuid import UUID
+
+from conftest import to_json
+from dataspike import Api, SQLiteCacheBackend
+from test_aml import AMLEntityFactory, AMLRequestFactory, AMLResponseFactory
+
+
+async def test_sqlite_backend_shared_between_instances(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    writer = SQLiteCacheBackend(path)
+    reader = SQLiteCacheBackend(path)
+    await writer.set("a", b"value")
+    assert await reader.get("a") == b"value"
+    await writer.delete("a")
+    reader._memory.clear()
+    assert await reader.get("a") is None
+    await writer.close()
+    await reader.close()
+
+
+async def test_sqlite_backend_ttl_and_eviction(tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / "cache.sqlite", max_entries=2, memory_entries=0)
+    await backend.set("expired", b"x", ttl=-1)
+    assert await backend.get("expired") is None
+
+    await backend.set("a", b"1")
+    await backend.set("b", b"2")
+    await backend.set("c", b"3")
+    assert await backend.get("a") is None
+    assert await backend.get("c") == b"3"
+    await backend.close()
+
+
+async def test_sqlite_backend_keeps_totals(tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / "cache.sqlite", max_entries=3, max_bytes=200, memory_entries=0)
+    await backend.set_many({"a": b"1", "b": b"22", "c": b"333"})
+    await backend.set("a", bytes(range(100)))
+    await backend.set("d", b"4")
+    await backend.delete("b")
+    await backend.set("e", bytes(range(100, 200)))
+
+    def totals():
+        conn = backend._connect()
+        expected = conn.execute("SELECT COUNT(*), SUM(size) FROM entries").fetchone()
+        return conn.execute("SELECT entries, bytes FROM totals").fetchone(), expected
+
+    got, expected = await backend._run(totals)
+    assert got == expected
+    assert expected[0] <= 3 and expected[1] <= 200
+    await backend.clear()
+    got, _ = await backend._run(totals)
+    assert got == (0, 0)
+    await backend.close()
+
+
+async def test_sqlite_backend_warm(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    backend = SQLiteCacheBackend(path)
+    await backend.set_many({"a": b"1", "b": b"2"})
+    await backend.close()
+
+    restarted = SQLiteCacheBackend(path)
+    assert await restarted.warm() == 2
+    assert sorted(restarted._memory) == ["a", "b"]
+    await restarted.close()
+
+
+async def test_aml_entities_served_from_backend(aioresponses, tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / "cache.sqlite")
+    response = AMLResponseFactory.build()
+    aioresponses.post("https://api.dataspike.io/api/v3/aml/search", body=to_json(response))
+
+    async with Api("token", aml_cache=backend) as api:
+        await api.aml.search(AMLRequestFactory.build())
+        for entity in response.data:
+            assert await api.aml.get(entity.uuid) == entity
+    aioresponses.assert_called_once()
+
+    entity_id = UUID(int=21314351524642462451465345)
+    entity = AMLEntityFactory.build(uuid=entity_id)
+    aioresponses.get(f"https://api.dataspike.io/api/v3/aml/search/{entity_id}", body=to_json(entity))
+    async with Api("token", aml_cache=backend) as api:
+        assert await api.aml.get(entity_id) == entity
+        assert await api.aml.get(entity_id) == entity
+    assert await backend.get(str(entity_id)) is not None
+    await backend.close()
@@ -1,6 +1,18 @@
+import base64
+import hashlib
+import json
 from io import BytesIO
 from uuid import UUID
-from dataspike import Api, DocumentType, Document
+
+import pytest
+import pytest_asyncio
+from aiohttp import ClientPayloadError, web
+from aiohttp.test_utils import TestServer
+
+from dataspike import Api, DocumentType, Document, DocumentInfo
+from dataspike.documents import download
+from dataspike.documents.download import ResumableDownload
+from dataspike.errors import DocumentIntegrityError
 from conftest import to_json
 
 
@@ -38,3 +50,319 @@ async def test_document_download_preview(aioresponses, api: Api):
     got = await api.document.download_preview(doc_id)
     assert got == expected
     aioresponses.assert_called_once()
+
+
+def mock_document(aioresponses, api: Api, doc_id: UUID, body: bytes):
+    aioresponses.get(
+        f"{api.api_endpoint}/api/v3/documents/{doc_id}",
+        body=body,
+        headers={"Content-Type": "image/png", "X-Document-Type": DocumentType.Passport},
+    )
+
+
+async def test_document_stream(aioresponses, api: Api):
+    doc_id = UUID(int=6472476938565623)
+    body = bytes(range(256)) * 1000
+    mock_document(aioresponses, api, doc_id, body)
+
+    async with api.document.stream(doc_id, chunk_size=1024) as document:
+        assert document.content_type == "image/png"
+        assert document.document_type == DocumentType.Passport
+        chunks = [chunk async for chunk in document.iter_chunks()]
+
+    assert max(len(chunk) for chunk in chunks) <= 1024
+    assert b"".join(chunks) == body
+
+
+async def test_document_download_to_path(aioresponses, api: Api, tmp_path):
+    doc_id = UUID(int=6472476938565623)
+    body = b"x" * 200_000
+    mock_document(aioresponses, api, doc_id, body)
+    path = tmp_path / "passport.png"
+
+    got = await api.document.download_to(doc_id, path)
+
+    assert got == DocumentInfo(size=len(body), document_type=DocumentType.Passport, content_type="image/png")
+    assert path.read_bytes() == body
+    assert list(tmp_path.iterdir()) == [path]
+
+
+async def test_document_download_to_async_writer(aioresponses, api: Api):
+    doc_id = UUID(int=6472476938565623)
+    mock_document(aioresponses, api, doc_id, b"content_of_file")
+
+    class Writer:
+        def __init__(self):
+            self.chunks = []
+
+        async def write(self, chunk: bytes) -> None:
+            self.chunks.append(chunk)
+
+    writer = Writer()
+    got = await api.document.download_to(doc_id, writer)
+    assert got.size == len(b"content_of_file")
+    assert b"".join(writer.chunks) == b"content_of_file"
+
+    buffer = BytesIO()
+    mock_document(aioresponses, api, doc_id, b"content_of_file")
+    await api.document.download_to(doc_id, buffer)
+    assert buffer.getvalue() == b"content_of_file"
+
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100_000
+
+
+@pytest_asyncio.fixture
+async def upload_server():
+    uploads = []
+
+    async def upload(request: web.Request) -> web.Response:
+        form = await request.post()
+        file = form["file"]
+        assert isinstance(file, web.FileField)
+        uploads.append(
+            {
+                "applicant_id": request.match_info["applicant_id"],
+                "content": file.file.read(),
+                "content_type": file.content_type,
+                "filename": file.filename,
+                "document_type": form["document_type"],
+                "chunked": request.headers.get("Transfer-Encoding") == "chunked",
+            }
+        )
+        return web.json_response({"document_id": str(UUID(int=len(uploads)))})
+
+    app = web.Application()
+    app.router.add_post("/api/v3/upload/{applicant_id}", upload)
+    async with TestServer(app) as server:
+        async with Api("token", str(server.make_url("")).rstrip("/")) as api:
+            yield api, uploads
+
+
+async def test_document_upload_path(upload_server, tmp_path):
+    api, uploads = upload_server
+    path = tmp_path / "passport.png"
+    path.write_bytes(PNG)
+
+    got = await api.document.upload(UUID(int=1), DocumentType.Passport, path)
+
+    assert got == UUID(int=1)
+    assert uploads[0]["content"] == PNG
+    assert uploads[0]["content_type"] == "image/png"
+    assert uploads[0]["filename"] == "passport.png"
+    assert uploads[0]["document_type"] == DocumentType.Passport
+
+
+async def test_document_upload_async_iterable(upload_server):
+    api, uploads = upload_server
+
+    async def chunks():
+        for i in range(0, len(PNG), 1000):
+            yield PNG[i : i + 1000]
+
+    await api.document.upload(UUID(int=1), DocumentType.Selfie, chunks())
+
+    assert uploads[0]["content"] == PNG
+    assert uploads[0]["content_type"] == "image/png"
+    assert uploads[0]["chunked"]
+
+
+async def test_document_upload_unseekable_file(upload_server):
+    api, uploads = upload_server
+
+    class Pipe:
+        def __init__(self, data: bytes):
+            self._data = BytesIO(data)
+
+        def read(self, size: int = -1) -> bytes:
+            return self._data.read(size)
+
+    await api.document.upload(UUID(int=1), DocumentType.Selfie, Pipe(PNG))
+    await api.document.upload(UUID(int=1), DocumentType.Selfie, BytesIO(PNG))
+
+    assert [u["content"] for u in uploads] == [PNG, PNG]
+    assert [u["content_type"] for u in uploads] == ["image/png", "image/png"]
+
+
+DOCUMENT = bytes(range(256)) * 4000
+ETAG = '"v1"'
+
+
+@pytest_asyncio.fixture
+async def range_server():
+    """
+    Serves DOCUMENT with Range support, server["drops"] responses are cut in the middle of body.
+    """
+    server = {"body": DOCUMENT, "etag": ETAG, "drops": 0, "ranges": [], "digest": None}
+
+    async def document(request: web.Request) -> web.StreamResponse:
+        body = server["body"]
+        start, end, status = 0, len(body) - 1, 200
+        headers = {
+            "ETag": server["etag"],
+            "Accept-Ranges": "bytes",
+            "Content-Type": "image/png",
+            "X-Document-Type": DocumentType.Passport,
+            "Repr-Digest": "sha-256=:"
+            + base64.b64encode(server["digest"] or hashlib.sha256(body).digest()).decode()
+            + ":",
+        }
+        requested = request.headers.get("Range")
+        server["ranges"].append(requested)
+        if requested and request.headers.get("If-Range", server["etag"]) == server["etag"]:
+            first, _, last = requested[len("bytes=") :].partition("-")
+            start, end, status = int(first), int(last) if last else end, 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+        payload = body[start : end + 1]
+        headers["Content-Length"] = str(len(payload))
+        response = web.StreamResponse(status=status, headers=headers)
+        await response.prepare(request)
+        if server["drops"]:
+            server["drops"] -= 1
+            await response.write(payload[: len(payload) // 2])
+            assert request.transport is not None
+            request.transport.close()
+            return response
+        await response.write(payload)
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/api/v3/documents/{document_id}", document)
+    async with TestServer(app) as test_server:
+        async with Api("token", str(test_server.make_url("")).rstrip("/")) as api:
+            yield api, server
+
+
+async def test_document_download_resumable_continues_after_drop(range_server, tmp_path):
+    api, server = range_server
+    server["drops"] = 1
+    path = tmp_path / "passport.png"
+
+    got = await api.document.download_resumable(UUID(int=1), path)
+
+    assert got == DocumentInfo(size=len(DOCUMENT), document_type=DocumentType.Passport, content_type="image/png")
+    assert path.read_bytes() == DOCUMENT
+    assert list(tmp_path.iterdir()) == [path]
+    assert server["ranges"][0] is None
+    assert server["ranges"][1].startswith("bytes=") and server["ranges"][1] != "bytes=0-"
+
+
+async def test_document_download_to_path_removes_partial_file(range_server, tmp_path):
+    api, server = range_server
+    server["drops"] = 1
+    path = tmp_path / "passport.png"
+
+    with pytest.raises(ClientPayloadError):
+        await api.document.download_to(UUID(int=1), path)
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_document_download_resumable_keeps_partial_file(range_server, tmp_path):
+    api, server = range_server
+    server["drops"] = 1
+    path = tmp_path / "passport.png"
+
+    with pytest.raises(ClientPayloadError):
+        await api.document.download_resumable(UUID(int=1), path, max_attempts=1)
+    assert not path.exists()
+    assert (tmp_path / "passport.png.part").exists()
+    assert (tmp_path / "passport.png.part.json").exists()
+
+    await api.document.download_resumable(UUID(int=1), path)
+    assert path.read_bytes() == DOCUMENT
+    assert server["ranges"][1] != "bytes=0-"
+
+
+async def test_document_download_resumable_parallel(range_server, tmp_path):
+    api, server = range_server
+    path = tmp_path / "passport.png"
+
+    await api.document.download_resumable(UUID(int=1), path, parallel=4, min_range_size=100_000)
+
+    assert path.read_bytes() == DOCUMENT
+    assert len(server["ranges"]) == 4
+    assert server["ranges"][1:] == ["bytes=256000-511999", "bytes=512000-767999", "bytes=768000-1023999"]
+
+
+async def test_document_download_resumable_saves_flushed_progress(range_server, tmp_path, monkeypatch):
+    api, server = range_server
+    path = tmp_path / "passport.png"
+    monkeypatch.setattr(download, "_SAVE_EVERY", 50_000)
+    write_state = ResumableDownload._write_state
+    saves = []
+
+    def check_state(self, data):
+        # every byte the saved state claims must already be in the part file
+        content = (tmp_path / "passport.png.part").read_bytes()
+        for start, _, done in json.loads(data)["ranges"]:
+            assert content[start : start + done] == DOCUMENT[start : start + done]
+        saves.append(data)
+        write_state(self, data)
+
+    monkeypatch.setattr(ResumableDownload, "_write_state", check_state)
+    # chunks smaller than the file buffer stay unflushed for a while
+    await api.document.download_resumable(UUID(int=1), path, parallel=4, min_range_size=100_000, chunk_size=1000)
+
+    assert path.read_bytes() == DOCUMENT
+    assert len(saves) > 4
+
+
+async def test_document_download_resumable_ignores_other_document_state(range_server, tmp_path):
+    api, server = range_server
+    server["drops"] = 1
+    path = tmp_path / "passport.png"
+    with pytest.raises(ClientPayloadError):
+        await api.document.download_resumable(UUID(int=1), path, max_attempts=1)
+
+    server["ranges"].clear()
+    await api.document.download_resumable(UUID(int=2), path)
+
+    assert path.read_bytes() == DOCUMENT
+    assert server["ranges"] == [None]
+
+
+async def test_document_download_resumable_restarts_changed_document(range_server, tmp_path):
+    api, server = range_server
+    server["drops"] = 1
+    path = tmp_path / "passport.png"
+    with pytest.raises(ClientPayloadError):
+        await api.document.download_resumable(UUID(int=1), path, max_attempts=1)
+
+    server["body"], server["etag"] = DOCUMENT[::-1], '"v2"'
+    await api.document.download_resumable(UUID(int=1), path)
+
+    assert path.read_bytes() == DOCUMENT[::-1]
+
+
+async def test_document_download_resumable_checksum_mismatch(range_server, tmp_path):
+    api, server = range_server
+    server["digest"] = hashlib.sha256(b"something else").digest()
+    path = tmp_path / "passport.png"
+
+    with pytest.raises(DocumentIntegrityError):
+        await api.document.download_resumable(UUID(int=1), path)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_document_upload_many(upload_server, tmp_path):
+    api, uploads = upload_server
+    path = tmp_path / "front.png"
+    path.write_bytes(PNG)
+    documents = [
+        (DocumentType.IdCardFront, path),
+        (DocumentType.IdCardBack, BytesIO(PNG)),
+        ("unknown", PNG),
+        (DocumentType.Selfie, PNG, None),
+    ]
+
+    results = await api.document.upload_many(UUID(int=7), documents, concurrency=3)
+
+    assert [r.item for r in results] == documents
+    assert [r.ok for r in results] == [True, True, False, True]
+    assert sorted(r.value for r in results if r.ok) == [UUID(int=1), UUID(int=2), UUID(int=3)]
+    assert sorted(u["document_type"] for u in uploads) == sorted(
+        [DocumentType.IdCardFront, DocumentType.IdCardBack, DocumentType.Selfie]
+    )
+    assert all(u["content"] == PNG for u in uploads)
@@ -0,0 +1,80 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from conftest import to_json
+from dataspike import Api, PagedResponse, Verification
+from dataspike.cli import main
+from dataspike.export import columns
+
+
+def mock_pages(aioresponses, verification, pages: int = 3, limit: int = 2) -> None:
+    for page in range(pages):
+        data = PagedResponse[Verification](data=[verification] * limit, has_next=page < pages - 1)
+        aioresponses.get(
+            f"https://api.dataspike.io/api/v3/verifications?page={page}&limit={limit}", status=200, body=to_json(data)
+        )
+
+
+async def test_export_ndjson_gzip(aioresponses, verification, api: Api, tmp_path):
+    mock_pages(aioresponses, verification)
+    path = tmp_path / "verifications.ndjson.gz"
+    reports = []
+
+    stats = await api.verification.export(path, limit=2, progress=lambda s: reports.append(s.rows))
+
+    assert stats.rows == 6 and stats.pages == 3
+    assert reports == [2, 4, 6]
+    with gzip.open(path, "rt") as f:
+        rows = [json.loads(line) for line in f]
+    assert [Verification(**row) for row in rows] == [verification] * 6
+
+
+async def test_export_csv_flattens_nested_fields(aioresponses, verification, api: Api, tmp_path):
+    mock_pages(aioresponses, verification, pages=1)
+    path = tmp_path / "verifications.csv"
+
+    await api.verification.export(path, limit=2)
+
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 2
+    row = rows[0]
+    assert list(row) == [c.name for c in columns(Verification)]
+    assert row["id"] == str(verification.id)
+    assert row["checks.document_mrz.status"] == "verified"
+    assert json.loads(row["checks.document_mrz.data"]) == {"mrz": {"name": "John"}}
+    assert row["checks.liveness.status"] == ""
+    assert row["poi_data.name"] == "John"
+    assert len(json.loads(row["documents"])) == 3
+
+
+async def test_export_unknown_format(api: Api, tmp_path):
+    with pytest.raises(ValueError):
+        await api.verification.export(tmp_path / "verifications.xml")
+
+
+def test_cli_export(aioresponses, verification, tmp_path, capsys):
+    mock_pages(aioresponses, verification, pages=2)
+    path = tmp_path / "out.csv.gz"
+
+    assert main(["--token", "token", "export", "verifications", str(path), "--limit", "2"]) == 0
+
+    with gzip.open(path, "rt", newline="") as f:
+        assert len(list(csv.DictReader(f))) == 4
+    assert "exported 4 rows" in capsys.readouterr().err
+
+
+async def test_export_parquet(aioresponses, verification, api: Api, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    mock_pages(aioresponses, verification)
+    path = tmp_path / "verifications.parquet"
+
+    await api.verification.export(path, limit=2)
+
+    table = parquet.read_table(path)
+    assert table.num_rows == 6
+    assert table.column("checks.document_mrz.status").to_pylist() == ["verified"] * 6
+    assert table.column("is_sandbox").to_pylist() == [False] * 6
@@ -0,0 +1,66 @@
+import asyncio
+from uuid import UUID
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from dataspike import Api, HedgingPolicy
+from dataspike.hedging import Hedger
+
+applicant_id = UUID(int=2135551524642452462234234)
+
+
+def stub_app(calls: list) -> web.Application:
+    async def get_applicant(request: web.Request) -> web.Response:
+        calls.append(request.path)
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+        return web.json_response({"applicant_id": str(applicant_id), "system_info": {}})
+
+    async def create_applicant(request: web.Request) -> web.Response:
+        calls.append(request.path)
+        await asyncio.sleep(0.1)
+        return web.json_response({"id": str(applicant_id)}, status=201)
+
+    app = web.Application()
+    app.router.add_get("/api/v3/applicants/{id}", get_applicant)
+    app.router.add_post("/api/v3/applicants", create_applicant)
+    return app
+
+
+async def test_hedged_get_takes_first_response():
+    calls: list = []
+    async with TestServer(stub_app(calls)) as server:
+        endpoint = str(server.make_url("")).rstrip("/")
+        async with Api("token", endpoint, hedging=HedgingPolicy(delay=0.05)) as api:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            got = await api.applicant.get(applicant_id)
+            assert loop.time() - started < 0.5
+            assert got is not None and got.applicant_id == applicant_id
+    assert len(calls) == 2
+
+
+async def test_post_is_never_hedged():
+    calls: list = []
+    async with TestServer(stub_app(calls)) as server:
+        endpoint = str(server.make_url("")).rstrip("/")
+        async with Api("token", endpoint, hedging=HedgingPolicy(delay=0.01)) as api:
+            assert await api.applicant.create("ex_id") == applicant_id
+    assert calls == ["/api/v3/applicants"]
+
+
+def test_hedger_budget_and_quantile():
+    hedger = Hedger(HedgingPolicy(min_samples=10, budget_ratio=0.5, budget_burst=1))
+    assert hedger.delay("GET /a") is None
+    for i in range(10):
+        hedger.observe("GET /a", i / 10)
+    assert hedger.delay("GET /a") == 0.9
+
+    assert hedger.acquire()
+    assert not hedger.acquire()
+    hedger.track()
+    assert not hedger.acquire()
+    hedger.track()
+    assert hedger.acquire()
+    assert hedger.hedged == 2
@@ -0,0 +1,100 @@
+import json
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from pydantic import TypeAdapter
+
+from dataspike import (
+    AMLSearchRequest,
+    Applicant,
+    ApplicantInfo,
+    CheckType,
+    DateRange,
+    PagedResponse,
+    RiskScore,
+    Verification,
+)
+from dataspike.json_backend import JsonBackend, OrjsonBackend, StdlibJsonBackend, get_json_backend, validate_parsed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson comes with the optional "fast" extra
+backends = [
+    pytest.param(StdlibJsonBackend, id="stdlib"),
+    pytest.param(
+        OrjsonBackend, id="orjson", marks=pytest.mark.skipif(orjson is None, reason="orjson is not installed")
+    ),
+]
+
+
+def make_data() -> dict:
+    return {
+        "id": UUID(int=1235),
+        "created_at": datetime(2024, 5, 1, 10, 30, 15, 123456),
+        "type": CheckType.Passport,
+        "types": iter([CheckType.Selfie]),
+        "request": AMLSearchRequest(
+            full_name="John Doe", risk_scores=[RiskScore.High], date_of_birth=DateRange(gte="1990-01-01")
+        ),
+        "page": PagedResponse[Applicant](
+            data=[Applicant(applicant_id=UUID(int=1), system_info=ApplicantInfo(full_name="John"))], has_next=True
+        ),
+    }
+
+
+@pytest.mark.parametrize("backend_cls", backends)
+def test_backends_encode_same(backend_cls):
+    backend = backend_cls()
+    decoded = backend.loads(backend.dumps(make_data()))
+    assert decoded["id"] == str(UUID(int=1235))
+    assert decoded["created_at"] == "2024-05-01T10:30:15.123456"
+    assert decoded["type"] == "passport"
+    assert decoded["types"] == ["selfie"]
+    assert decoded["request"]["date_of_birth"] == {"gte": "1990-01-01", "lte": None}
+    assert decoded["page"]["data"][0]["system_info"]["full_name"] == "John"
+    assert decoded == json.loads(StdlibJsonBackend().dumps(make_data()))
+
+
+def test_get_json_backend():
+    assert get_json_backend("auto").name == ("stdlib" if orjson is None else "orjson")
+    assert get_json_backend("stdlib").name == "stdlib"
+    backend = StdlibJsonBackend()
+    assert get_json_backend(backend) is backend
+    with pytest.raises(ValueError):
+        get_json_backend("yaml")
+
+
+@pytest.mark.parametrize("backend_cls", backends)
+def test_backends_validate_same(backend_cls, verification):
+    backend = backend_cls()
+    adapter = TypeAdapter(PagedResponse[Verification])
+    page = PagedResponse[Verification](data=[verification], has_next=False)
+    raw = StdlibJsonBackend().dumps(page).encode()
+    assert backend.validate(adapter, raw) == page
+
+
+@pytest.mark.parametrize("backend_cls", backends)
+def test_backends_validate_parsed(backend_cls):
+    loaded = []
+
+    class Backend(backend_cls):
+        def loads(self, data):
+            loaded.append(data)
+            return super().loads(data)
+
+    backend = Backend()
+    page = PagedResponse[Verification](data=[], has_next=False)
+    raw = b'{"data": [], "has_next": false}'
+    assert backend.validate(TypeAdapter(PagedResponse[Verification]), raw) == page
+    assert loaded == []
+    assert backend.validate(validate_parsed(TypeAdapter(PagedResponse[Verification])), raw) == page
+    assert loaded == [raw]
+
+
+def test_json_backend_is_abstract():
+    with pytest.raises(TypeError):
+        JsonBackend()  # type: ignore[abstract]
@@ -0,0 +1,83 @@
+import asyncio
+from typing import List, Tuple
+
+from conftest import to_json
+from dataspike import AdaptiveLimit, Api, PagedResponse, Verification
+from dataspike.pagination import iter_items, iter_pages
+
+
+def make_fetch(total: int, delay: float = 0.0):
+    calls: List[Tuple[int, int]] = []
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def fetch(page: int, limit: int) -> PagedResponse[int]:
+        calls.append((page, limit))
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            state["in_flight"] -= 1
+        start = page * limit
+        return PagedResponse[int](data=list(range(start, min(start + limit, total))), has_next=start + limit < total)
+
+    return fetch, calls, state
+
+
+async def test_iter_pages_prefetches_in_background():
+    fetch, calls, state = make_fetch(100, delay=0.01)
+    items = []
+    async for page in iter_pages(fetch, limit=10, prefetch=3):
+        items.extend(page.data)
+        await asyncio.sleep(0.01)
+
+    assert items == list(range(100))
+    assert state["max_in_flight"] == 3
+    # pages requested past the last one are cancelled
+    assert calls[:10] == [(i, 10) for i in range(10)]
+
+
+async def test_iter_pages_without_prefetch_is_sequential():
+    fetch, calls, state = make_fetch(25)
+    items = [item async for item in iter_items(iter_pages(fetch, limit=10, prefetch=0))]
+
+    assert items == list(range(25))
+    assert calls == [(0, 10), (1, 10), (2, 10)]
+    assert state["max_in_flight"] == 1
+
+
+async def test_iter_pages_adaptive_limit_keeps_offsets():
+    fetch, calls, _ = make_fetch(1000)
+    adaptive = AdaptiveLimit(target_latency=1.0, min_limit=10, max_limit=80)
+    items = [item async for item in iter_items(iter_pages(fetch, limit=10, prefetch=0, adaptive=adaptive))]
+
+    assert items == list(range(1000))
+    assert max(limit for _, limit in calls) == 80
+    offset = 0
+    for page, limit in calls:
+        assert page * limit == offset
+        offset += limit
+
+
+async def test_iter_all_stops_early():
+    fetch, calls, state = make_fetch(1000, delay=0.01)
+    items = iter_items(iter_pages(fetch, limit=10, prefetch=2))
+    async for item in items:
+        if item == 15:
+            break
+    await items.aclose()
+    await asyncio.sleep(0)
+
+    assert state["in_flight"] == 0
+    assert len(calls) <= 4
+
+
+async def test_verifications_iter_all(aioresponses, verification, api: Api):
+    for page in range(3):
+        data = PagedResponse[Verification](data=[verification] * 2, has_next=page < 2)
+        aioresponses.get(
+            f"https://api.dataspike.io/api/v3/verifications?page={page}&limit=2", status=200, body=to_json(data)
+        )
+
+    got = [v async for v in api.verification.iter_all(limit=2, prefetch=1)]
+    assert got == [verification] * 6
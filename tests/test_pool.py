@@ -0,0 +1,34 @@
+import pytest
+from aiohttp import TCPConnector
+
+from dataspike import Api, PoolConfig
+
+
+async def test_pool_config_applied():
+    pool = PoolConfig(limit=20, limit_per_host=5, keepalive_timeout=30, ttl_dns_cache=60)
+    async with Api("token", pool=pool) as api:
+        connector = api._session.connector
+        assert isinstance(connector, TCPConnector)
+        assert connector.limit == 20
+        assert connector.limit_per_host == 5
+
+
+async def test_pool_and_connector_are_exclusive():
+    connector = TCPConnector()
+    with pytest.raises(ValueError):
+        Api("token", pool=PoolConfig(), connector=connector)
+    await connector.close()
+
+
+async def test_shared_connector():
+    connector = PoolConfig(limit=10).connector()
+    api1 = Api.from_connector("token1", connector)
+    api2 = Api.from_connector("token2", connector)
+    assert api1._session.connector is connector
+    assert api2._session.connector is connector
+
+    await api1.close()
+    assert not connector.closed
+    await api2.close()
+    assert not connector.closed
+    await connector.close()
@@ -0,0 +1,88 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from dataspike import Api, RateLimit, RateLimiter, RetryPolicy
+from dataspike.ratelimit import TokenBucket, AdaptiveConcurrency
+
+
+async def test_token_bucket_rate():
+    bucket = TokenBucket(rate=100, burst=2)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for _ in range(6):
+        await bucket.acquire()
+    # 2 tokens are available at once, 4 more take 10ms each
+    assert loop.time() - started >= 0.035
+
+
+def test_families_have_separate_budgets():
+    limiter = RateLimiter(default=RateLimit(rate=50), limits={"aml": RateLimit(rate=1)})
+    assert limiter.bucket("aml") is not limiter.bucket("applicants")
+    assert limiter.bucket("applicants") is limiter.bucket("verifications")
+    assert limiter.limit_for("aml") == RateLimit(rate=1)
+    assert RateLimiter(limits={"aml": RateLimit(rate=1)}).bucket("applicants") is None
+
+
+async def test_adaptive_concurrency():
+    concurrency = AdaptiveConcurrency(8, minimum=1)
+    generations = [await concurrency.acquire() for _ in range(4)]
+    for g in generations:
+        await concurrency.release(g, throttled=True)
+    # only the first throttled response of a generation shrinks the limit
+    assert concurrency.limit == 4
+    g = await concurrency.acquire()
+    await concurrency.release(g, throttled=False)
+    assert concurrency.limit == 4.25
+
+
+async def test_adaptive_limiter_with_stub_server():
+    calls = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal calls
+        calls += 1
+        if calls <= 3:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.json_response({"data": [], "has_next": False})
+
+    app = web.Application()
+    app.router.add_get("/api/v3/applicants", handler)
+    async with TestServer(app) as server:
+        limiter = RateLimiter(default=RateLimit(rate=1000, burst=10, max_concurrency=16), adaptive=True)
+        retry = RetryPolicy(max_attempts=5, base_delay=0)
+        endpoint = str(server.make_url("")).rstrip("/")
+        async with Api("token", endpoint, retry=retry, limiter=limiter) as api:
+            await api.applicant.list()
+            concurrency = limiter.concurrency("applicants")
+            assert concurrency is not None
+            assert concurrency.limit < 16
+            shrunk = concurrency.limit
+            await asyncio.gather(*(api.applicant.list(page=i) for i in range(5)))
+            assert concurrency.limit > shrunk
+            assert concurrency.in_flight == 0
+    assert calls == 9
+
+
+async def test_limiter_slot_held_until_response_released():
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response({"data": [], "has_next": False})
+
+    app = web.Application()
+    app.router.add_get("/api/v3/applicants", handler)
+    async with TestServer(app) as server:
+        limiter = RateLimiter(default=RateLimit(rate=1000, burst=10, max_concurrency=1))
+        endpoint = str(server.make_url("")).rstrip("/")
+        async with Api("token", endpoint, limiter=limiter) as api:
+            concurrency = limiter.concurrency("applicants")
+            assert concurrency is not None
+            async with api.applicant._request("GET", "/api/v3/applicants") as response:
+                # headers arrived, but the body isn't read yet
+                assert concurrency.in_flight == 1
+                second = asyncio.ensure_future(api.applicant.list())
+                await asyncio.sleep(0.05)
+                assert not second.done()
+                await response.read()
+            assert (await second).data == []
+            assert concurrency.in_flight == 0
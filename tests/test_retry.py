@@ -0,0 +1,99 @@
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from typing import List
+from uuid import UUID
+
+import pytest
+from aiohttp import ClientConnectionError
+
+from conftest import to_json
+from dataspike import Api, Applicant, ApplicantInfo, RetryPolicy, RetryEvent
+from dataspike.errors import UnexpectedResponseStatus
+from dataspike.retry import parse_retry_after
+
+
+def fast_policy(events=None, **kwargs) -> RetryPolicy:
+    return RetryPolicy(base_delay=0, max_delay=0, on_retry=events.append if events is not None else None, **kwargs)
+
+
+async def test_retry_get_on_server_error(aioresponses):
+    applicant_id = UUID(int=2135551524642452462234234)
+    applicant = Applicant(applicant_id=applicant_id, system_info=ApplicantInfo(full_name="John Doe"))
+    url = f"https://api.dataspike.io/api/v3/applicants/{applicant_id}"
+    aioresponses.get(url, status=503)
+    aioresponses.get(url, exception=ClientConnectionError("reset"))
+    aioresponses.get(url, body=to_json(applicant))
+
+    events = []
+    async with Api("token", retry=fast_policy(events)) as api:
+        got = await api.applicant.get(applicant_id)
+    assert got == applicant
+    assert [(e.attempt, e.status, type(e.error)) for e in events] == [
+        (1, 503, type(None)),
+        (2, None, ClientConnectionError),
+    ]
+
+
+async def test_retry_gives_up_after_max_attempts(aioresponses):
+    applicant_id = UUID(int=2135551524642452462234234)
+    url = f"https://api.dataspike.io/api/v3/applicants/{applicant_id}"
+    aioresponses.get(url, status=500, repeat=True)
+
+    events = []
+    async with Api("token", retry=fast_policy(events, max_attempts=2)) as api:
+        with pytest.raises(UnexpectedResponseStatus) as e:
+            await api.applicant.get(applicant_id)
+    assert e.value.code == 500
+    assert len(events) == 1
+
+
+async def test_retry_reports_attempts_on_complete(aioresponses):
+    applicant_id = UUID(int=2135551524642452462234234)
+    url = f"https://api.dataspike.io/api/v3/applicants/{applicant_id}"
+    applicant = Applicant(applicant_id=applicant_id, system_info=ApplicantInfo(full_name="John Doe"))
+    aioresponses.get(url, status=503)
+    aioresponses.get(url, body=to_json(applicant))
+    aioresponses.get(url, exception=ClientConnectionError("reset"), repeat=True)
+    aioresponses.post("https://api.dataspike.io/api/v3/applicants", status=503)
+
+    completed = []
+    policy = fast_policy(max_attempts=2, on_complete=lambda *args: completed.append(args))
+    async with Api("token", retry=policy) as api:
+        assert await api.applicant.get(applicant_id) == applicant
+        with pytest.raises(ClientConnectionError):
+            await api.applicant.get(applicant_id)
+        with pytest.raises(UnexpectedResponseStatus):
+            await api.applicant.create("ex_id1")
+    assert completed == [("GET", url, 2), ("GET", url, 2)]
+
+
+async def test_no_retry_for_non_idempotent(aioresponses):
+    aioresponses.post("https://api.dataspike.io/api/v3/applicants", status=503)
+
+    events: list = []
+    async with Api("token", retry=fast_policy(events)) as api:
+        with pytest.raises(UnexpectedResponseStatus):
+            await api.applicant.create("ex_id1")
+    assert events == []
+
+
+async def test_retry_after_header(aioresponses):
+    url = "https://api.dataspike.io/api/v3/applicants?page=0&limit=10"
+    aioresponses.get(url, status=429, headers={"Retry-After": "0"})
+    aioresponses.get(url, body=to_json({"data": [], "has_next": False}))
+
+    events: List[RetryEvent] = []
+    async with Api("token", retry=RetryPolicy(base_delay=100, on_retry=events.append)) as api:
+        got = await api.applicant.list()
+    assert got.data == []
+    assert events[0].status == 429
+    assert events[0].delay == 0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5
+    assert parse_retry_after("-1") == 0
+    assert parse_retry_after("junk") is None
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    delay = parse_retry_after(date)
+    assert delay is not None and 25 < delay <= 30
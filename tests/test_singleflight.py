@@ -0,0 +1,68 @@
+import asyncio
+from uuid import UUID
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from dataspike import Api
+from dataspike.singleflight import SingleFlight
+
+applicant_id = UUID(int=2135551524642452462234234)
+
+
+async def test_concurrent_gets_are_coalesced():
+    calls = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return web.json_response({"applicant_id": str(applicant_id), "system_info": {}})
+
+    app = web.Application()
+    app.router.add_get("/api/v3/applicants/{id}", handler)
+    async with TestServer(app) as server:
+        endpoint = str(server.make_url("")).rstrip("/")
+        async with Api("token", endpoint) as api:
+            results = await asyncio.gather(*(api.applicant.get(applicant_id) for _ in range(10)))
+            assert calls == 1
+            assert all(r is results[0] for r in results)
+
+            await api.applicant.get(applicant_id)
+            assert calls == 2
+
+
+async def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow() -> int:
+        started.set()
+        await asyncio.sleep(0.05)
+        return 42
+
+    first = asyncio.ensure_future(flight.do("key", slow))
+    second = asyncio.ensure_future(flight.do("key", slow))
+    await started.wait()
+    first.cancel()
+    assert await second == 42
+    assert first.cancelled()
+    assert len(flight) == 0
+
+
+async def test_shared_call_cancelled_without_waiters():
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def slow() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    caller = asyncio.ensure_future(flight.do("key", slow))
+    await asyncio.sleep(0)
+    caller.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert len(flight) == 0
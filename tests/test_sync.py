@@ -1,3 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+from pydantic import ValidationError
+
 from conftest import to_json
 from uuid import UUID
 from dataspike import Applicant, ApplicantInfo, SyncApi
@@ -13,3 +19,75 @@ def test_sync_applicant_get(aioresponses, sync: SyncApi):
     got = sync.applicant.get(applicant_id)
     aioresponses.assert_called_once()
     assert got == applicant
+
+
+def test_sync_background_loop_shared_by_threads(aioresponses):
+    ids = [UUID(int=i) for i in range(1, 9)]
+    for applicant_id in ids:
+        applicant = Applicant(applicant_id=applicant_id, system_info=ApplicantInfo(full_name="John Doe"))
+        aioresponses.get(f"https://api.dataspike.io/api/v3/applicants/{applicant_id}", body=to_json(applicant))
+
+    with SyncApi("token_sync", background_loop=True) as sync:
+        with ThreadPoolExecutor(4) as pool:
+            got = list(pool.map(sync.applicant.get, ids))
+
+    assert [a.applicant_id for a in got] == ids
+    with pytest.raises(RuntimeError):
+        sync.applicant.get(ids[0])
+    sync.close()
+
+
+async def test_sync_background_loop_inside_running_loop(aioresponses):
+    applicant_id = UUID(int=235135)
+    applicant = Applicant(applicant_id=applicant_id, system_info=ApplicantInfo(full_name="John Doe"))
+    aioresponses.get(f"https://api.dataspike.io/api/v3/applicants/{applicant_id}", body=to_json(applicant))
+
+    # blocking call from a coroutine doesn't touch the running loop
+    with SyncApi("token_sync", background_loop=True) as sync:
+        assert sync.applicant.get(applicant_id) == applicant
+
+
+def test_sync_binds_methods_lazily(sync: SyncApi):
+    assert {"get", "list", "create", "delete"} <= set(dir(sync.applicant))
+    assert "iter_all" not in dir(sync.applicant)
+    assert sync.applicant.get is sync.applicant.get
+    assert sync.applicant.get.__name__ == "get"
+    for name in ("iter_all", "_request"):
+        with pytest.raises(AttributeError):
+            getattr(sync.applicant, name)
+
+
+def mock_applicants(aioresponses, ids):
+    for applicant_id in ids:
+        applicant = Applicant(applicant_id=applicant_id, system_info=ApplicantInfo(full_name="John Doe"))
+        aioresponses.get(f"https://api.dataspike.io/api/v3/applicants/{applicant_id}", body=to_json(applicant))
+
+
+@pytest.mark.parametrize("background_loop", [False, True])
+def test_sync_map(aioresponses, background_loop):
+    ids = [UUID(int=i) for i in range(1, 7)]
+    mock_applicants(aioresponses, ids[:3] + ids[4:])
+    aioresponses.get(f"https://api.dataspike.io/api/v3/applicants/{ids[3]}", status=500, body="error")
+
+    with SyncApi("token_sync", background_loop=background_loop) as sync:
+        results = sync.map(sync.applicant.get, ids, concurrency=3)
+
+    assert [r.item for r in results] == ids
+    assert [r.ok for r in results] == [True, True, True, False, True, True]
+    assert [r.value.applicant_id for r in results if r.ok] == ids[:3] + ids[4:]
+
+
+def test_sync_gather(aioresponses, sync: SyncApi):
+    ids = [UUID(int=1), UUID(int=2)]
+    mock_applicants(aioresponses, ids)
+
+    first, second, broken = sync.gather(
+        (sync.applicant.get, ids[0]),
+        partial(sync.applicant.get, applicant_id=ids[1]),
+        (sync.applicant.get, "not an uuid"),
+    )
+
+    assert first.unwrap().applicant_id == ids[0]
+    assert second.unwrap().applicant_id == ids[1]
+    assert isinstance(broken.error, ValidationError)
+    assert sync.gather() == []
@@ -0,0 +1,65 @@
+import json
+from uuid import uuid4
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from conftest import to_json
+from dataspike import Api, Applicant, ApplicantInfo, ApplicantVerificationStatus, PagedResponse, Verification
+from dataspike.trusted import adapter_for, construct
+from dataspike.verifications.verifications import Verifications
+
+
+async def test_trusted_verification_get(aioresponses, verification):
+    aioresponses.get(f"https://api.dataspike.io/api/v3/verifications/{verification.id}", body=to_json(verification))
+
+    async with Api("token1", validation="trusted") as api:
+        assert api.verification.get.__func__ is Verifications.get.raw_function  # type: ignore[attr-defined]
+        got = await api.verification.get(verification.id)
+
+    assert type(got) is Verification
+    assert got == verification
+    assert got.mrz_data == {"mrz": {"name": "John"}}
+
+
+async def test_trusted_applicant_list_fills_defaults(aioresponses):
+    applicant_id = uuid4()
+    body = to_json(
+        {"data": [{"applicant_id": str(applicant_id), "system_info": {"full_name": "John"}}], "has_next": True}
+    )
+    aioresponses.get("https://api.dataspike.io/api/v3/applicants?page=0&limit=10", body=body)
+
+    async with Api("token1", validation="trusted") as api:
+        got = await api.applicant.list()
+
+    assert isinstance(got, PagedResponse)
+    assert got.has_next
+    assert list(got.data) == [Applicant(applicant_id=applicant_id, system_info=ApplicantInfo(full_name="John"))]
+    assert got.data[0].verification_status is ApplicantVerificationStatus.Initial
+
+
+def test_construct_needs_registered_adapter(verification):
+    data = json.loads(to_json(verification))
+    assert construct(adapter_for(Verification), data) == verification
+    with pytest.raises(ValueError):
+        construct(TypeAdapter(Verification), data)
+
+
+@pytest.mark.parametrize(
+    "created_at", ["2023-07-01T01:24:17.380971021Z", "2023-07-01T01:24:17.3809+02:00", "2023-07-01T01:24:17"]
+)
+def test_construct_parses_any_fraction_digits(verification, created_at):
+    data = json.loads(to_json(verification))
+    data["created_at"] = created_at
+    adapter = adapter_for(Verification)
+    assert construct(adapter, data) == adapter.validate_python(data)
+
+
+async def test_strict_validates_arguments(api: Api):
+    with pytest.raises(ValidationError):
+        await api.verification.get("not an uuid")  # type: ignore[arg-type]
+
+
+async def test_unknown_validation_mode():
+    with pytest.raises(ValueError):
+        Api("token1", validation="loose")
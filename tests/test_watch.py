@@ -0,0 +1,134 @@
+from dataclasses import replace
+from uuid import uuid4
+
+import pytest
+from yarl import URL
+
+from conftest import to_json
+from dataspike import Api, CheckResult, CheckStatus, Checks, PagedResponse, VerificationStatus, WatchPolicy
+from dataspike.errors import UnexpectedResponseStatus
+from dataspike.verifications.watch import watch_verifications
+
+FAST = WatchPolicy(min_interval=0.001, max_interval=0.01, jitter=0)
+
+
+async def test_watch_yields_only_changes(verification):
+    pending = replace(verification, status=VerificationStatus.Pending, checks=Checks())
+    in_progress = replace(pending, status=VerificationStatus.InProgress)
+    ocr_done = replace(in_progress, checks=Checks(document_ocr=CheckResult(status=CheckStatus.Verified)))
+    states = [pending, pending, in_progress, in_progress, ocr_done, ocr_done, verification]
+    gets = []
+
+    async def get(id):
+        gets.append(id)
+        return states[len(gets) - 1]
+
+    async def list_page(page, limit):
+        raise AssertionError("single verification isn't swept")
+
+    changes = [change async for change in watch_verifications(get, list_page, [verification.id], FAST)]
+
+    assert len(gets) == len(states)
+    assert [c.verification for c in changes] == [in_progress, ocr_done, verification]
+    assert [c.status_changed for c in changes] == [True, False, True]
+    assert changes[1].changed_checks == ("document_ocr",)
+    assert changes[1].previous == in_progress
+    assert changes[-1].completed
+
+
+async def test_watch_sweeps_list_pages(verification):
+    pending = [replace(verification, id=uuid4(), status=VerificationStatus.Pending) for _ in range(30)]
+    unrelated = [replace(verification, id=uuid4()) for _ in range(5)]
+    pages = []
+
+    async def get(id):
+        raise AssertionError("all verifications are found on list pages")
+
+    async def list_page(page, limit):
+        pages.append(page)
+        # verifications complete after the first sweep
+        rows = pending if len(pages) <= 2 else [replace(v, status=VerificationStatus.Verified) for v in pending]
+        rows = unrelated + rows
+        return PagedResponse(data=rows[page * limit : (page + 1) * limit], has_next=(page + 1) * limit < len(rows))
+
+    policy = replace(FAST, page_limit=20)
+    changes = [change async for change in watch_verifications(get, list_page, [v.id for v in pending], policy)]
+
+    assert pages == [0, 1, 0, 1]
+    assert sorted(c.verification.id for c in changes) == sorted(v.id for v in pending)
+    assert all(c.previous is not None and c.previous.status == VerificationStatus.Pending for c in changes)
+
+
+async def test_watch_falls_back_to_get(verification):
+    ids = [uuid4() for _ in range(20)]
+    gets = []
+
+    async def get(id):
+        gets.append(id)
+        return replace(verification, id=id)
+
+    async def list_page(page, limit):
+        return PagedResponse(data=[], has_next=False)
+
+    changes = [change async for change in watch_verifications(get, list_page, ids, FAST)]
+
+    assert sorted(gets) == sorted(ids)
+    assert [c.verification.id for c in changes] == ids
+
+
+async def test_verification_wait_for(aioresponses, verification, api: Api):
+    url = f"{api.api_endpoint}/api/v3/verifications/{verification.id}"
+    aioresponses.get(url, body=to_json(replace(verification, status=VerificationStatus.Pending)))
+    aioresponses.get(url, body=to_json(verification))
+
+    got = await api.verification.wait_for(verification.id, timeout=5, policy=FAST)
+
+    assert got == verification
+
+
+async def test_verification_wait_for_missing(aioresponses, api: Api):
+    vid = uuid4()
+    aioresponses.get(f"{api.api_endpoint}/api/v3/verifications/{vid}", status=404)
+
+    assert await api.verification.wait_for(vid, policy=FAST) is None
+
+
+async def test_watch_retries_transient_errors(verification):
+    gets = []
+
+    async def get(id):
+        gets.append(id)
+        if len(gets) < 3:
+            raise UnexpectedResponseStatus("GET", 503 if len(gets) == 1 else 429, None, "unavailable")
+        return verification
+
+    async def list_page(page, limit):
+        raise AssertionError("single verification isn't swept")
+
+    changes = [change async for change in watch_verifications(get, list_page, [verification.id], FAST)]
+
+    assert len(gets) == 3
+    assert [c.verification for c in changes] == [verification]
+
+
+async def test_verification_wait_for_raises_client_errors(aioresponses, api: Api):
+    vid = uuid4()
+    aioresponses.get(f"{api.api_endpoint}/api/v3/verifications/{vid}", status=401, repeat=True)
+
+    with pytest.raises(UnexpectedResponseStatus) as e:
+        await api.verification.wait_for(vid, timeout=5, policy=FAST)
+    assert e.value.code == 401
+    assert len(aioresponses.requests[("GET", URL(f"{api.api_endpoint}/api/v3/verifications/{vid}"))]) == 1
+
+
+async def test_watch_sweep_raises_client_errors(verification):
+    async def get(id):
+        raise AssertionError("client errors of the sweep aren't hidden by individual requests")
+
+    async def list_page(page, limit):
+        raise UnexpectedResponseStatus("GET", 403, None, "forbidden")
+
+    with pytest.raises(UnexpectedResponseStatus):
+        ids = [uuid4() for _ in range(30)]
+        async for _ in watch_verifications(get, list_page, ids, FAST):
+            pass
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from dataspike import AMLScreening, CheckStatus, EventType, Verification, VerificationStatus, WebhookReceiver
+
+PAYLOADS = Path(__file__).parent.parent / "examples" / "payloads" / "webhooks"
+SECRET = "webhook_secret"
+
+
+def payload(name: str) -> bytes:
+    return (PAYLOADS / name).read_bytes()
+
+
+@pytest_asyncio.fixture
+async def client():
+    receiver = WebhookReceiver(SECRET, queue_size=2, put_timeout=0.05)
+    app = web.Application()
+
+    async def health(request: web.Request) -> web.Response:
+        return web.Response(text="ok")
+
+    app.router.add_get("/health", health)
+    receiver.add_routes(app, "/hooks/dataspike")
+    async with TestClient(TestServer(app)) as client:
+        yield client, receiver
+
+
+async def post(client: TestClient, receiver: WebhookReceiver, body: bytes, signature=None):
+    headers = {"X-Dataspike-Signature": signature or "sha256=" + receiver.sign(body)}
+    return await client.post("/hooks/dataspike", data=body, headers=headers)
+
+
+async def test_webhook_docver_event(client):
+    client, receiver = client
+
+    response = await post(client, receiver, payload("docver_webhook_failed.json"))
+
+    assert response.status == 200
+    event = await receiver.get()
+    assert event.event_type == EventType.Docver
+    assert isinstance(event.payload, Verification)
+    assert event.payload.status == VerificationStatus.Failed
+    checks = event.payload.checks
+    assert checks is not None and checks.face_comparison is not None
+    face_comparison = checks.face_comparison
+    assert face_comparison.status == CheckStatus.Failed
+    assert face_comparison.errors[0].code == 7002
+    assert (await client.get("/health")).status == 200
+
+
+async def test_webhook_aml_event(client):
+    client, receiver = client
+
+    assert (await post(client, receiver, payload("aml_screening_medium_risk.json"))).status == 200
+
+    event = await receiver.get()
+    assert event.event_type == EventType.AmlScreening
+    assert isinstance(event.payload, AMLScreening)
+    assert event.payload.search_result.requested_name == "abc abc"
+    assert event.payload.risk_score == {"type": "Medium"}
+    assert event.payload.search_result.data[0].fields.media
+
+
+async def test_webhook_rejects_bad_signature(client):
+    client, receiver = client
+    body = payload("docver_webhook_verified.json")
+
+    assert (await post(client, receiver, body, signature="sha256=" + "0" * 64)).status == 401
+    assert (await client.post("/hooks/dataspike", data=body)).status == 401
+    assert receiver.queue.empty()
+
+
+async def test_webhook_rejects_invalid_payload(client):
+    client, receiver = client
+
+    assert (await post(client, receiver, b'{"event_type": "DOCVER", "payload": {}}')).status == 400
+    assert (await post(client, receiver, b"not json")).status == 400
+    assert (await post(client, receiver, b"[]")).status == 400
+    assert (await post(client, receiver, b'"x"')).status == 400
+
+
+async def test_webhook_backpressure(client):
+    client, receiver = client
+    body = payload("docver_webhook_verified.json")
+
+    assert [(await post(client, receiver, body)).status for _ in range(3)] == [200, 200, 503]
+
+    events = receiver.__aiter__()
+    await events.__anext__()
+    assert (await post(client, receiver, body)).status == 200
+
+
+@pytest.mark.parametrize("name", sorted(p.name for p in PAYLOADS.iterdir()))
+def test_webhook_trusted_decoding_matches_strict(name):
+    strict = WebhookReceiver(None).decode(payload(name))
+    trusted = WebhookReceiver(None, validation="trusted").decode(payload(name))
+    assert trusted == strict